@@ -4,6 +4,8 @@ VERSION MISE À JOUR - Février 2026
 - Scenario Agent v7: 11 étapes avec validation
 """
 
+from types import MappingProxyType
+
 # =============================================================================
 # RÈGLES DE PRODUCTION VIDÉO (par catégorie)
 # =============================================================================
@@ -183,6 +185,9 @@ PRESETS = {
     },
 }
 
+# Lecture seule : partagés tels quels, copier (dict(...)) avant de modifier
+PRESETS = {name: MappingProxyType(steps) for name, steps in PRESETS.items()}
+
 
 # =============================================================================
 # VALEURS PAR DÉFAUT
@@ -221,6 +226,10 @@ DEFAULT_CONFIG = {
     "global_min_score": 0.75,
     "max_attempts": 5,
     "max_video_attempts": 4,
+    "max_video_concurrent": 4,  # vidéos fal.ai générées en parallèle
+    "video_cache": True,  # réutilise une vidéo déjà générée (même prompt + keyframes)
+    "video_cache_max_gb": 5,  # au-delà, les vidéos en cache les plus anciennes sont supprimées
+    "video_cache_max_age_days": 30,
     "validation_config": {
         "face_shape": {"min": 0.8, "ref": "user_photo", "label": "Forme du visage IDENTIQUE"},
         "face_features": {"min": 0.8, "ref": "user_photo", "label": "Traits du visage = MÊME PERSONNE"},
@@ -0,0 +1,67 @@
+"""
+Sublym v4 - Fixtures pytest partagées
+Validateurs faciaux partagés par session : DeepFace/ArcFace chargés une fois par config.
+"""
+
+import sys
+from pathlib import Path
+from types import MappingProxyType
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from testutils import VERBOSE
+
+# Config de validation identique à test.py (lecture seule)
+FACE_CONFIG = MappingProxyType({
+    "models": {"vision": "gemini-2.5-flash"},
+    "prompt_strict_prefix": "",
+    "prompt_strict_suffix": "",
+    "validation_config": {
+        "face_shape": {"min": 0.8, "ref": "user_photo", "label": "Forme du visage IDENTIQUE"},
+        "face_features": {"min": 0.8, "ref": "user_photo", "label": "Traits du visage = MÊME PERSONNE"},
+        "skin_tone": {"min": 0.8, "ref": "user_photo", "label": "Teinte de peau exacte"},
+        "hair_color": {"min": 0.8, "ref": "user_photo", "label": "Couleur cheveux exacte"},
+        "natural_pose": {"min": 0.8, "ref": "none", "label": "Pose naturelle"},
+        "no_deformation": {"min": 0.9, "ref": "none", "label": "Aucune déformation"},
+    },
+    "global_min_score": 0.75,
+    "face_validation": {"tolerance": 0.3, "threshold": 0.8},
+    "face_tolerance_by_shot": {
+        "close_up": 0.2,
+        "medium": 0.3,
+        "medium_full": 0.4,
+        "full": 0.5,
+        "wide": 0.6,
+        "far": 0.6,
+        "profile": 0.4,
+        "back_three_quarter": None,
+    },
+})
+
+
+@pytest.fixture(scope="session")
+def make_face_validator():
+    """Fabrique d'ImageValidator partagés par config : modèles chargés une fois par config.
+    
+    Chaque test garde sa propre config et appelle set_run_dir() pour ses sorties.
+    """
+    # Import ici : la collecte pytest ne charge pas DeepFace/ArcFace pour rien
+    from services.image_validator import ImageValidator
+
+    validators = {}
+
+    def make(config):
+        # config gardée dans la valeur : son id ne peut pas être réutilisé
+        if id(config) not in validators:
+            validators[id(config)] = (config, ImageValidator(config, dry_run=False, verbose=VERBOSE))
+        return validators[id(config)][1]
+
+    return make
+
+
+@pytest.fixture(scope="session")
+def face_validator(make_face_validator):
+    """ImageValidator partagé avec FACE_CONFIG (config de test.py)."""
+    return make_face_validator(FACE_CONFIG)
@@ -5,6 +5,7 @@ VERSION v7 - Février 2026
 - Prompts vidéo générés directement en anglais (step 11)
 - Validation V1/V2/V3 sur modèle économique (GPT-4o-mini)
 - Retry sur échec vidéo (max 4 tentatives)
+- Génération vidéo parallèle entre scènes (max_video_concurrent)
 - Validation de complétude avant montage
 - Échec global si vidéos manquantes
 - Nommage répertoire avec titre du rêve
@@ -64,6 +65,9 @@ class DreamPipeline:
             keyframes_dir: str = None, videos_dir: str = None, scenario_json: str = None,
             reject: List[str] = None, daily_context: str = "") -> Dict:
         
+        # Copie locale : run() désactive des étapes en cours de route (montage)
+        steps = dict(steps)
+
         # Génération de l'ID de run
         self.run_id = str(uuid.uuid4())[:8]
 
@@ -793,7 +797,9 @@ class DreamPipeline:
 
                 total_scenes = len(state.get("video_scenarios") or [])
 
-                for idx, vs in enumerate(state.get("video_scenarios") or []):
+                # Specs des scènes générables (keyframes présents)
+                pending = []
+                for vs in state.get("video_scenarios") or []:
                     scene_id = vs.get("scene_id", 1)
                     sid = self._sid(scene_id)
                     start_p = state["keyframe_paths"].get(f"start_{sid}")
@@ -805,39 +811,59 @@ class DreamPipeline:
                         results["warnings"].append(f"Scene {scene_id}: missing keyframes")
                         continue
 
-                    video_path = self.run_dir / "videos" / f"scene_{sid}.mp4"
+                    video_path = str(self.run_dir / "videos" / f"scene_{sid}.mp4")
                     shooting = vs.get("shooting", {})
+                    pending.append((scene_id, video_path, {
+                        "start_image": start_p,
+                        "end_image": end_p,
+                        "action": vs.get("action", ""),
+                        "camera_movement": shooting.get("camera_movement", "static"),
+                        "is_pov": vs.get("is_pov", False),
+                        "duration": 6,
+                        "output_path": video_path,
+                        "transition_path": vs.get("transition_path", ""),
+                    }))
+                scene_order = [video_path for _, video_path, _ in pending]
+
+                # RETRY LOOP : chaque tentative relance en parallèle les scènes restantes
+                generated = set()
+                for attempt in range(self.MAX_VIDEO_ATTEMPTS):
+                    if not pending:
+                        break
+                    print(f"\n--- VIDÉOS: {len(pending)} scène(s) - Tentative {attempt + 1}/{self.MAX_VIDEO_ATTEMPTS} ---")
 
                     # Progress: 65-92% for videos
-                    vid_pct = 65 + int(27 * idx / max(total_scenes, 1))
-                    self._emit_progress(vid_pct, "generate_videos", f"Vidéo scène {scene_id}/{total_scenes}...")
-
-                    # RETRY LOOP
-                    video_success = False
-                    for attempt in range(self.MAX_VIDEO_ATTEMPTS):
-                        print(f"\n--- VIDÉO SCÈNE {scene_id} - Tentative {attempt + 1}/{self.MAX_VIDEO_ATTEMPTS} ---")
-                        
-                        result = self.video_gen.generate(
-                            start_p, end_p, vs.get("action", ""),
-                            shooting.get("camera_movement", "static"),
-                            vs.get("is_pov", False), 6, str(video_path),
-                            transition_path=vs.get("transition_path", ""))
-                        
+                    vid_pct = 65 + int(27 * len(generated) / max(total_scenes, 1))
+                    self._emit_progress(vid_pct, "generate_videos", f"Vidéos {len(generated)}/{total_scenes}...")
+
+                    def on_video_done(i, result, batch_scenes=pending):
+                        # Progression 65-92% mise à jour à chaque scène terminée
+                        if result.get("success"):
+                            generated.add(batch_scenes[i][1])
+                            pct = 65 + int(27 * len(generated) / max(total_scenes, 1))
+                            self._emit_progress(pct, "generate_videos", f"Vidéos {len(generated)}/{total_scenes}...")
+
+                    batch = self.video_gen.generate_many([spec for _, _, spec in pending], on_done=on_video_done)
+
+                    remaining = []
+                    for (scene_id, video_path, spec), result in zip(pending, batch):
                         if result.get("success"):
                             print(f"   ✅ Vidéo scène {scene_id} générée")
-                            state["video_paths"].append(str(video_path))
-                            video_success = True
-                            break
+                            generated.add(video_path)
                         else:
-                            error_msg = result.get("error", "Unknown error")
-                            print(f"   ❌ Échec: {error_msg}")
-                            if attempt < self.MAX_VIDEO_ATTEMPTS - 1:
-                                print(f"   🔄 Nouvelle tentative...")
-                    
-                    if not video_success:
-                        print(f"\n❌ ÉCHEC DÉFINITIF: Scène {scene_id} après {self.MAX_VIDEO_ATTEMPTS} tentatives")
-                        state["failed_videos"].append(scene_id)
-                        results["errors"].append(f"Scene {scene_id}: video generation failed")
+                            print(f"   ❌ Échec scène {scene_id}: {result.get('error', 'Unknown error')}")
+                            remaining.append((scene_id, video_path, spec))
+                    if remaining and attempt < self.MAX_VIDEO_ATTEMPTS - 1:
+                        print(f"   🔄 Nouvelle tentative...")
+                    pending = remaining
+
+                for scene_id, _, _ in pending:
+                    print(f"\n❌ ÉCHEC DÉFINITIF: Scène {scene_id} après {self.MAX_VIDEO_ATTEMPTS} tentatives")
+                    state["failed_videos"].append(scene_id)
+                    results["errors"].append(f"Scene {scene_id}: video generation failed")
+
+                # Ordre du scénario conservé pour le montage
+                state["video_paths"] = [vp for vp in scene_order if vp in generated]
                 
                 results["steps_executed"].append("generate_videos")
                 
@@ -4,6 +4,9 @@ VERSION MISE À JOUR - Février 2026
 Les valeurs entre {accolades} sont remplacées dynamiquement
 """
 
+import string
+from functools import lru_cache
+
 # =============================================================================
 # ANALYSE PERSONNAGE
 # =============================================================================
@@ -1198,6 +1201,44 @@ DEFAULTS = {
 }
 
 
+@lru_cache(maxsize=128)
+def compile_template(template):
+    """Parse a str.format template once into (literal, field, spec, conversion) parts.
+
+    Returns None if the template uses fields render_template() does not handle
+    (indexing, attributes, nested specs); callers then fall back to str.format.
+    """
+    parts = tuple(string.Formatter().parse(template))
+    for _, field, spec, _ in parts:
+        if field is not None and (not field.isidentifier() or "{" in (spec or "")):
+            return None
+    return parts
+
+
+_CONVERSIONS = {"r": repr, "s": str, "a": ascii}
+
+
+def render_template(template, **kwargs):
+    """Same result as template.format(**kwargs), without re-parsing the template on each call."""
+    parts = compile_template(template)
+    if parts is None:
+        return template.format(**kwargs)
+    out = []
+    for literal, field, spec, conversion in parts:
+        out.append(literal)
+        if field is not None:
+            value = kwargs[field]
+            if conversion:
+                value = _CONVERSIONS[conversion](value)
+            out.append(format(value, spec))
+    return "".join(out)
+
+
+# Templates par défaut compilés à l'import
+for _template in DEFAULTS.values():
+    compile_template(_template)
+
+
 def get_prompt(config, code, **kwargs):
     """Return a prompt from external config (database) or hardcoded default.
 
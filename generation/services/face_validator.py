@@ -62,7 +62,9 @@ class FaceValidator:
                 print(f"⚠️ Erreur init ArcFace: {e}")
                 self.arcface_app = None
 
-        # Stats
+        self._reset_stats()
+
+    def _reset_stats(self):
         self.stats = {
             "total_validations": 0,
             "passed": 0,
@@ -70,6 +72,12 @@ class FaceValidator:
             "rejected_details": []
         }
 
+    def set_run_dir(self, run_dir: str):
+        """Nouveau run : redirige les rejets et remet les stats à zéro (modèles conservés)."""
+        self.run_dir = Path(run_dir)
+        self.rejected_dir = self.run_dir / "rejected"
+        self._reset_stats()
+
     def validate(
         self,
         generated_image_path: str,
@@ -0,0 +1,29 @@
+"""
+Sublym v4 - JSON rapide
+orjson si installé (décodage/encodage en C), sinon json stdlib
+"""
+
+import json
+
+# Import conditionnel pour la dépendance optionnelle
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def loads(data):
+    """Décode du JSON depuis str ou bytes."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    if isinstance(data, (bytes, bytearray)):
+        data = data.decode("utf-8")
+    return json.loads(data)
+
+
+def dumps(obj) -> bytes:
+    """Encode en JSON UTF-8 (corps de requête HTTP)."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode("utf-8")
@@ -0,0 +1,35 @@
+"""
+Sublym v4 - HTTP session partagée
+Connexions keep-alive réutilisées entre appels (évite un handshake TCP+TLS par requête)
+"""
+
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """Retourne la session HTTP du process (créée au premier appel).
+
+    Retry/backoff sur les erreurs de connexion uniquement : les POST ne sont
+    jamais rejoués (une génération fal.ai/OpenAI relancée serait facturée deux fois).
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=8,
+                    pool_maxsize=32,  # >= nb de threads par scène
+                    max_retries=Retry(total=3, backoff_factor=0.5),
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _session = session
+    return _session
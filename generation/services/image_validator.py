@@ -28,8 +28,9 @@ class ImageValidator:
         self.validation_config = config.get("validation_config", {})
         self.global_min_score = config.get("global_min_score", 0.75)
         
-        # Face validator sera initialisé avec le run_dir
+        # Face validator sera initialisé avec le run_dir, au premier plan avec visage
         self.face_validator: Optional[FaceValidator] = None
+        self.run_dir: Optional[str] = None
         
         # Tracking
         self.costs_real = {"tokens_input": 0, "tokens_output": 0, "calls": 0}
@@ -37,8 +38,15 @@ class ImageValidator:
         self.all_validations = []  # Track ALL validations with full details
     
     def set_run_dir(self, run_dir: str):
-        """Initialise le FaceValidator avec le répertoire de run."""
-        self.face_validator = FaceValidator(self.config, run_dir, self.verbose)
+        """Mémorise le répertoire de run (FaceValidator chargé à la demande)."""
+        self.run_dir = run_dir
+        if self.face_validator is not None:
+            # ArcFace déjà initialisé : on ne recharge pas les modèles
+            self.face_validator.set_run_dir(run_dir)
+
+    def _face_check_needed(self, shot_type: str) -> bool:
+        """False si le plan ne montre pas le visage (tolérance None, ex: dos)."""
+        return self.config.get("face_tolerance_by_shot", {}).get(shot_type, 0) is not None
     
     def validate(
         self,
@@ -72,6 +80,28 @@ class ImageValidator:
         if self.dry_run:
             return {"passed": True, "global_score": 0.95, "failures": [], "face_validation": None}
 
+        # Plan de dos sans Gemini : rien à valider, aucun modèle facial chargé
+        face_needed = self._face_check_needed(shot_type)
+        if not face_needed and not self.model:
+            # Tracé comme les autres : le rapport compte toutes les keyframes
+            self.all_validations.append({
+                "scene_id": scene_id,
+                "kf_type": kf_type,
+                "attempt": attempt,
+                "passed": True,
+                "gemini_score": 0.0,
+                "gemini_is_same_person": None,
+                "gemini_scores": {},
+                "gemini_major_issues": [],
+                "face_result": None,
+                "failures": [],
+                "image_path": image_path,
+                "description": description[:200] if description else None,
+                "skipped_reason": "back_shot",
+            })
+            return {"passed": True, "global_score": 1.0, "failures": [], "face_validation": None,
+                    "gemini_result": None, "skipped_reason": "back_shot"}
+
         # 1. Validation Gemini (optionnelle - seulement si modèle vision configuré)
         gemini_result = None
         gemini_score = 0.0
@@ -86,8 +116,11 @@ class ImageValidator:
             gemini_passed = gemini_result.get("passed", False)
 
         # 2. Validation faciale biométrique (DeepFace + ArcFace uniquement, PAS Gemini)
+        #    Ignorée (et ArcFace non initialisé) pour les plans sans visage
         face_result = None
-        if references.get("user_photo") and self.face_validator:
+        if references.get("user_photo") and self.run_dir and face_needed:
+            if self.face_validator is None:
+                self.face_validator = FaceValidator(self.config, self.run_dir, self.verbose)
             face_result = self.face_validator.validate(
                 generated_image_path=image_path,
                 reference_image_path=references["user_photo"],
@@ -437,7 +470,7 @@ Reply in JSON:
             "costs": self.costs_real,
             "config": {
                 "global_min_score": self.global_min_score,
-                "validation_criteria": self.validation_config,
+                "validation_criteria": dict(self.validation_config),
                 "model": self.model,
             }
         }
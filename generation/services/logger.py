@@ -0,0 +1,95 @@
+"""
+Sublym v4 - Logs
+Lignes de progression bufferisées sur stdout, vidées une fois par étape (flush_logs)
+"""
+
+import atexit
+import functools
+import inspect
+import logging
+import os
+import sys
+
+_handler = None
+
+
+class _BufferedHandler(logging.StreamHandler):
+    """StreamHandler sans flush à chaque ligne."""
+
+    def emit(self, record):
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+        except Exception:
+            self.handleError(record)
+
+
+class _CurrentStdoutHandler(_BufferedHandler):
+    """Écrit sur le sys.stdout du moment (capture pytest, redirect_stdout...)."""
+
+    def __init__(self):
+        super().__init__(sys.stdout)
+
+    @property
+    def stream(self):
+        return sys.stdout
+
+    @stream.setter
+    def stream(self, value):
+        pass
+
+
+def get_logger(name: str = "sublym") -> logging.Logger:
+    """Logger sous "sublym" (handler stdout installé au premier appel)."""
+    global _handler
+    if _handler is None:
+        if sys.stdout is sys.__stdout__:
+            try:
+                # fd dupliqué : buffer propre, fermer le flux ne ferme pas stdout
+                stream = open(os.dup(sys.stdout.fileno()), "w", buffering=64 * 1024, encoding="utf-8")
+                _handler = _BufferedHandler(stream)
+            except (AttributeError, OSError, ValueError):
+                pass
+        if _handler is None:
+            _handler = _CurrentStdoutHandler()  # stdout remplacé : suivre sys.stdout à chaque ligne
+        _handler.setFormatter(logging.Formatter("%(message)s"))
+        root = logging.getLogger("sublym")
+        root.addHandler(_handler)
+        root.setLevel(logging.INFO)
+        root.propagate = False
+        atexit.register(_close_logs)
+    return logging.getLogger(name)
+
+
+def _close_logs():
+    """atexit : vide le buffer puis ferme le fd dupliqué (stdout lui-même reste ouvert)."""
+    flush_logs()
+    if type(_handler) is _BufferedHandler:
+        logging.getLogger("sublym").removeHandler(_handler)
+        _handler.stream.close()
+
+
+def flush_logs():
+    """Vide les lignes en attente (après ce qui a déjà été print sur stdout)."""
+    sys.stdout.flush()
+    if _handler is not None:
+        _handler.flush()
+
+
+def flush_after(func):
+    """Décorateur : flush_logs() en sortie de func (sync ou async)."""
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                flush_logs()
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        try:
+            return func(*args, **kwargs)
+        finally:
+            flush_logs()
+    return wrapper
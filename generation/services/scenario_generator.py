@@ -2,7 +2,7 @@
 Sublym v4 - Scenario Generator
 VERSION v7 - 11 étapes avec triple validation graduée (V1/V2/V3)
 - Validation graduée: full (V1+V2+V3), medium (V1+V3), light (V1)
-- Parallélisation par scène: steps 4,5,6,7,8,11 via ThreadPoolExecutor
+- Parallélisation par scène: steps 4,5,6,7,8,11 + scénarios vidéo (legacy/pub) via ThreadPoolExecutor
 - Modèle validation séparé (GPT-4o-mini) pour réduction des coûts
 
 Steps:
@@ -21,24 +21,183 @@ Steps:
 Conserve les modes pub et free_scenes en rétrocompatibilité.
 """
 
+import hashlib
 import json
 import re
 import time
 import threading
-import urllib.request
+from collections import OrderedDict
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Dict, List, Any, Optional, Tuple
+from types import MappingProxyType
+from typing import Dict, List, Any, Mapping, Optional, Tuple
 
+from . import fast_json
 from .env_loader import get_api_key
+from .http_session import get_session
 from .audit_log import AuditLog
 from config.settings import DEFAULT_MODELS, PRODUCTION_RULES, get_rules
 from prompts.templates import (
     PROMPT_SCENARIO_GLOBAL, PROMPT_FREE_SCENES,
     PROMPT_SCENARIO_VIDEO, PROMPT_SCENARIO_VIDEO_POV,
     PROMPT_SCENARIO_PUB, PROMPT_SCENARIO_PUB_VIDEO_1A, PROMPT_SCENARIO_PUB_VIDEO_1B,
-    RULES_PUB
+    RULES_PUB, render_template
 )
 
+OPENAI_CHAT_URL = "https://api.openai.com/v1/chat/completions"
+
+
+# =============================================================================
+# MOCKS DRY RUN (constantes figées, copiées à chaque appel via _fresh)
+# =============================================================================
+
+_MOCK_GLOBAL_PHASES = ("PREPARATION", "DEPART", "DECOUVERTE", "ACTION", "CONNEXION", "ACCOMPLISSEMENT")
+_MOCK_GLOBAL_TIMES = ("morning", "midday", "golden_hour", "sunset")
+
+_MOCK_VIDEO_SCENARIO = MappingProxyType({
+    "start_keyframe": {
+        "description": "Debut scene 1",
+        "location": "Lieu",
+        "pose": "Pose initiale",
+        "expression": "Expression naturelle",
+        "expression_intensity": "moderate",
+        "gaze_direction": "away_left",
+        "outfit": "Tenue",
+        "accessories": ""
+    },
+    "end_keyframe": {
+        "description": "Fin scene",
+        "pose": "Pose finale",
+        "expression": "Expression finale",
+        "expression_intensity": "moderate"
+    },
+    "action": "Action simple",
+    "shooting": {
+        "shot_type": "medium",
+        "camera_angle": "eye_level",
+        "camera_movement": "static",
+        "lighting_direction": "side",
+        "lighting_temperature": "warm",
+        "depth_of_field": "shallow",
+        "focus_on": "face"
+    }
+})
+
+_MOCK_POV_SCENARIO = MappingProxyType({
+    "start_keyframe": {
+        "description": "Vue subjective",
+        "foreground": "Main tenant cafe",
+        "midground": "Horizon mer",
+        "background": "Ciel",
+        "lighting": "Lumiere doree"
+    },
+    "end_keyframe": {
+        "description": "Vue legerement changee",
+        "change": "Lumiere plus chaude"
+    },
+    "action": "Leger mouvement",
+    "shooting": {"depth_of_field": "shallow", "lighting_temperature": "warm"}
+})
+
+_MOCK_PUB_TRANSITION_SCENES = (
+    MappingProxyType({
+        "id": "1A", "type": "TRANSITION_AWAKENING",
+        "concept": "Du bureau au reve",
+        "daily_environment": "Bureau gris et morne",
+        "dream_environment": "Atelier lumineux",
+        "emotional_arc": "lassitude -> emerveillement",
+        "time_of_day": "morning", "indoor": True, "is_pov": False,
+        "allows_camera_look": False
+    }),
+    MappingProxyType({
+        "id": "1B", "type": "TRANSITION_ACTION",
+        "concept": "Premiers pas dans le reve",
+        "context": "Exploration de l'atelier",
+        "emotional_beat": "joie, curiosite",
+        "time_of_day": "morning", "indoor": False, "is_pov": False,
+        "allows_camera_look": False
+    }),
+)
+_MOCK_PUB_PHASES = ("ACTION", "ACTION", "IMMERSION", "ACTION", "INTERACTION", "ACTION", "ACCOMPLISSEMENT")
+_MOCK_PUB_TIMES = ("morning", "afternoon", "golden_hour", "sunset")
+
+_MOCK_PUB_SCENARIO = MappingProxyType({
+    "title": "Pub reve",
+    "daily_context_description": "Bureau morne",
+    "daily_palette": ("#9E9E9E", "#BDBDBD", "#E0E0E0", "#F5F5F5"),
+    "dream_palette": ("#FF6B35", "#F7C59F", "#1A535C", "#4ECDC4"),
+    "character_b": {"present": False},
+    "scenes": (),
+})
+
+_MOCK_PUB_1A = MappingProxyType({
+    "start_keyframe": {
+        "description": "Personnage dans bureau gris, face a droite, posture voutee",
+        "location": "Bureau open space terne",
+        "pose": "Face a droite, legerement voute, bras le long du corps",
+        "expression": "Lassitude, ennui",
+        "expression_intensity": "moderate",
+        "gaze_direction": "down",
+        "outfit": "Chemise grise, pantalon sombre",
+        "accessories": ""
+    },
+    "end_keyframe": {
+        "description": "Meme personnage dans atelier lumineux, tete relevee",
+        "location": "Atelier creatif lumineux",
+        "pose": "Tete relevee, corps redresse",
+        "expression": "Emerveillement, surprise joyeuse",
+        "expression_intensity": "moderate",
+        "gaze_direction": "up",
+        "outfit": "Meme chemise grise",
+        "accessories": ""
+    },
+    "action": "L'environnement se transforme du bureau gris a l'atelier lumineux",
+    "shooting": {
+        "shot_type": "medium_full", "camera_angle": "eye_level",
+        "camera_movement": "static", "lighting_direction": "front",
+        "lighting_temperature": "cool_to_warm", "depth_of_field": "medium",
+        "focus_on": "face"
+    }
+})
+
+_MOCK_PUB_1B = MappingProxyType({
+    "start_keyframe": {
+        "description": "Personnage emerveille dans atelier lumineux (= end 1A)",
+        "location": "Atelier creatif lumineux",
+        "pose": "Tete relevee, corps redresse",
+        "expression": "Emerveillement",
+        "expression_intensity": "moderate",
+        "gaze_direction": "up"
+    },
+    "end_keyframe": {
+        "description": "Personnage explorant l'atelier, tourne vers la gauche",
+        "location": "Atelier creatif lumineux",
+        "pose": "En mouvement, premier pas, orientation vers la gauche",
+        "expression": "Joie, curiosite",
+        "expression_intensity": "moderate",
+        "gaze_direction": "away_left"
+    },
+    "action": "Le personnage fait ses premiers pas dans le monde de reve",
+    "shooting": {
+        "shot_type": "medium_full", "camera_angle": "eye_level",
+        "camera_movement": "slow_pan_left", "lighting_direction": "side",
+        "lighting_temperature": "warm", "depth_of_field": "medium",
+        "focus_on": "full_body"
+    }
+})
+
+
+def _fresh(template: Mapping, **overrides) -> Dict:
+    """Copie modifiable d'un mock figé (dicts imbriqués copiés, tuples -> listes)."""
+    out = {}
+    for key, value in template.items():
+        if isinstance(value, Mapping):
+            value = dict(value)
+        elif isinstance(value, tuple):
+            value = list(value)
+        out[key] = value
+    out.update(overrides)
+    return out
+
 
 class ScenarioGenerator:
     """Génère les scénarios via LLM.
@@ -47,6 +206,8 @@ class ScenarioGenerator:
     Mode pub/free_scenes: méthodes héritées (rétrocompatibilité).
     """
 
+    VALIDATION_CACHE_SIZE = 256
+
     def __init__(self, config: Dict, dry_run: bool = False, verbose: bool = False):
         self.config = config
         self.dry_run = dry_run
@@ -59,6 +220,17 @@ class ScenarioGenerator:
         self.strict_prefix = config.get("prompt_strict_prefix", "")
         self.strict_suffix = config.get("prompt_strict_suffix", "")
 
+        # Options de tournage jointes une fois (identiques pour toutes les scènes des prompts legacy)
+        self._joined_options = {
+            key: ", ".join(config.get(key) or [])
+            for key in (
+                "shot_types", "camera_angles", "camera_movements",
+                "lighting_directions", "lighting_temperatures",
+                "depth_of_field_options", "focus_options",
+                "expression_intensities", "gaze_directions",
+            )
+        }
+
         # v7 config
         self.validation_config = config.get("validation", {})
         self.enable_v1 = self.validation_config.get("enable_v1", True)
@@ -78,6 +250,10 @@ class ScenarioGenerator:
         self.audit = AuditLog()
         self._scenario = {}  # v7 internal state
 
+        # Cache des validations V1/V2/V3 (même réponse + même contexte = même verdict)
+        self._validation_cache = OrderedDict()
+        self._validation_cache_lock = threading.Lock()
+
     # =========================================================================
     # V7: MÉTHODE PRINCIPALE
     # =========================================================================
@@ -2153,9 +2329,16 @@ Also provide a brief French summary.""",
 
         # Validation graduée
         if validation_level != "none":
-            v1, v2, v3 = self._validate(
-                str(answer), question, criterion, rules, level=validation_level
-            )
+            problem = self._precheck_answer(answer, schema)
+            if problem:
+                # Réponse structurellement invalide : inutile de payer V1/V2/V3
+                v1 = {"score": 0.0, "passed": False, "feedback": problem}
+                v2 = {"score": 0.0, "passed": False, "feedback": problem}
+                v3 = {"final_pass": False, "reasoning": problem, "confidence": 1.0, "optimization_suggestions": []}
+            else:
+                v1, v2, v3 = self._validate(
+                    str(answer), question, criterion, rules, level=validation_level
+                )
             self.audit.validation(v1, v2, v3)
 
             if v3.get("final_pass"):
@@ -2176,6 +2359,15 @@ Also provide a brief French summary.""",
             "medium": V1 + V3     (étapes importantes: découpage, paramètres, cadrage)
             "light":  V1 seul     (étapes simples: palettes, rythme, blocages, attitudes)
         """
+        cache_key = hashlib.sha256(
+            "\0".join((level, rules, criterion, question, answer, self._context)).encode("utf-8")
+        ).hexdigest()
+        with self._validation_cache_lock:
+            cached = self._validation_cache.get(cache_key)
+            if cached is not None:
+                self._validation_cache.move_to_end(cache_key)
+                return cached
+
         rules_block = f"\n{rules}\n" if rules else ""
         do_v1 = self.enable_v1 and level in ("full", "medium", "light")
         do_v2 = self.enable_v2 and level == "full"
@@ -2238,8 +2430,33 @@ Also provide a brief French summary.""",
             v3["final_pass"] = v3.get("final_pass", False)
             v3["confidence"] = float(v3.get("confidence", 0.5))
 
+        # Un appel en échec (timeout, rate limit) n'est pas un verdict : pas de cache, on retentera
+        if not any(self._is_call_error(v) for v in (v1, v2, v3)):
+            with self._validation_cache_lock:
+                self._validation_cache[cache_key] = (v1, v2, v3)
+                if len(self._validation_cache) > self.VALIDATION_CACHE_SIZE:
+                    self._validation_cache.popitem(last=False)
+
         return v1, v2, v3
 
+    @staticmethod
+    def _is_call_error(result: dict) -> bool:
+        """True si result est le retour d'erreur de _call_openai_structured."""
+        return (str(result.get("reasoning", "")).startswith("Error:")
+                or ("data" in result and not result["data"]))
+
+    @staticmethod
+    def _precheck_answer(answer: Any, schema: Optional[dict]) -> Optional[str]:
+        """Contrôle structurel local (sans LLM). Retourne la raison d'échec ou None."""
+        if answer is None or answer == "" or answer == {} or answer == []:
+            return "Reponse vide"
+        if isinstance(schema, dict) and schema:
+            if not isinstance(answer, dict):
+                return "Reponse non structuree (objet JSON attendu)"
+            if not any(key in answer for key in schema):
+                return "Aucune cle du schema presente"
+        return None
+
     # =========================================================================
     # LLM CALLS
     # =========================================================================
@@ -2270,14 +2487,14 @@ Also provide a brief French summary.""",
 
         for attempt in range(self.max_retries):
             try:
-                req = urllib.request.Request(
-                    "https://api.openai.com/v1/chat/completions",
-                    data=json.dumps(payload).encode("utf-8"),
-                    headers={"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
+                response = get_session().post(
+                    OPENAI_CHAT_URL,
+                    data=fast_json.dumps(payload),
+                    headers={"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"},
+                    timeout=self.llm_timeout
                 )
-
-                with urllib.request.urlopen(req, timeout=self.llm_timeout) as response:
-                    result = json.loads(response.read().decode("utf-8"))
+                response.raise_for_status()
+                result = fast_json.loads(response.content)
 
                 usage = result.get("usage", {})
                 tokens_in = usage.get("prompt_tokens", 0)
@@ -2299,7 +2516,7 @@ Also provide a brief French summary.""",
                         self.costs_generation["calls"] += 1
 
                 content = result["choices"][0]["message"]["content"]
-                return json.loads(content)
+                return fast_json.loads(content)
 
             except Exception as e:
                 if attempt < self.max_retries - 1:
@@ -2320,19 +2537,20 @@ Also provide a brief French summary.""",
             "max_tokens": 2000
         }
 
-        req = urllib.request.Request(
-            "https://api.openai.com/v1/chat/completions",
-            data=json.dumps(payload).encode("utf-8"),
-            headers={"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
+        response = get_session().post(
+            OPENAI_CHAT_URL,
+            data=fast_json.dumps(payload),
+            headers={"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"},
+            timeout=60
         )
-
-        with urllib.request.urlopen(req, timeout=60) as response:
-            result = json.loads(response.read().decode("utf-8"))
+        response.raise_for_status()
+        result = fast_json.loads(response.content)
 
         usage = result.get("usage", {})
-        self.costs_real["tokens_input"] += usage.get("prompt_tokens", 0)
-        self.costs_real["tokens_output"] += usage.get("completion_tokens", 0)
-        self.costs_real["calls"] += 1
+        with self._costs_lock:
+            self.costs_real["tokens_input"] += usage.get("prompt_tokens", 0)
+            self.costs_real["tokens_output"] += usage.get("completion_tokens", 0)
+            self.costs_real["calls"] += 1
 
         return result["choices"][0]["message"]["content"]
 
@@ -2344,7 +2562,7 @@ Also provide a brief French summary.""",
         match = re.search(r'\{[\s\S]*\}', text)
         if match:
             try:
-                return json.loads(match.group())
+                return fast_json.loads(match.group())
             except:
                 pass
         return {}
@@ -2525,7 +2743,8 @@ Also provide a brief French summary.""",
 
         reject_text = "\n".join(f"- {r}" for r in reject) if reject else "Aucun"
 
-        prompt = PROMPT_SCENARIO_GLOBAL.format(
+        prompt = render_template(
+            PROMPT_SCENARIO_GLOBAL,
             strict_prefix=self.strict_prefix,
             dream_statement=dream_statement,
             character_name=character_name,
@@ -2581,7 +2800,8 @@ Also provide a brief French summary.""",
 
         reject_text = "\n".join(f"- {r}" for r in reject) if reject else "Aucun"
 
-        prompt = PROMPT_FREE_SCENES.format(
+        prompt = render_template(
+            PROMPT_FREE_SCENES,
             strict_prefix=self.strict_prefix,
             dream_statement=dream_statement,
             character_name=character_name,
@@ -2590,7 +2810,7 @@ Also provide a brief French summary.""",
             nb_scenes=nb_scenes,
             nb_pov_scenes=nb_pov_scenes,
             dream_elements_json=dream_elements_json,
-            shot_types=", ".join(self.config.get("shot_types", [])),
+            shot_types=self._joined_options["shot_types"],
             imposed_scenes=imposed_str,
             reject_text=reject_text,
             strict_suffix=self.strict_suffix
@@ -2626,7 +2846,8 @@ Also provide a brief French summary.""",
         total_scenes = nb_dream_scenes + 2
         last_scene_id = nb_dream_scenes + 1
 
-        prompt = PROMPT_SCENARIO_PUB.format(
+        prompt = render_template(
+            PROMPT_SCENARIO_PUB,
             strict_prefix=self.strict_prefix,
             dream_statement=dream_statement,
             daily_context=daily_context,
@@ -2674,15 +2895,13 @@ Also provide a brief French summary.""",
         title = pub_scenario.get("title", "Spot pub")
         daily_palette = pub_scenario.get("daily_palette", [])
         dream_palette = pub_scenario.get("dream_palette", [])
+        dream_palette_str = self._join_palette(dream_palette)
+        joined_palettes = {sid: self._join_palette(p) for sid, p in scene_palettes.items()}
 
-        video_scenarios = []
-
-        for scene in scenes:
+        def _process(i, scene):
             scene_id = scene["id"]
             scene_type = scene.get("type", "")
 
-            print(f"\n  [Scene {scene_id}] {scene_type} - {scene.get('concept', '')[:40]}")
-
             if scene_type == "TRANSITION_AWAKENING":
                 vs = self._generate_pub_1a_scenario(
                     scene, title, character_name, character_gender, age,
@@ -2694,10 +2913,10 @@ Also provide a brief French summary.""",
                     character_features, dream_palette
                 )
             elif scene.get("is_pov", False):
-                palette = scene_palettes.get(scene_id, dream_palette)
+                palette = joined_palettes.get(scene_id, dream_palette_str)
                 vs = self._generate_pov_scenario(scene, title, len(scenes), palette)
             else:
-                palette = scene_palettes.get(scene_id, dream_palette)
+                palette = joined_palettes.get(scene_id, dream_palette_str)
                 vs = self._generate_standard_scenario(
                     scene, title, len(scenes), character_name, character_gender,
                     age, character_features, False, palette
@@ -2706,8 +2925,12 @@ Also provide a brief French summary.""",
             vs["scene_id"] = scene_id
             vs["is_pov"] = scene.get("is_pov", False)
             vs["scene_type"] = scene_type
-            video_scenarios.append(vs)
+            return i, vs
 
+        video_scenarios = self._run_per_scene(_process, scenes)
+
+        for scene, vs in zip(scenes, video_scenarios):
+            print(f"\n  [Scene {scene['id']}] {scene.get('type', '')} - {scene.get('concept', '')[:40]}")
             print(f"    > Start: {vs.get('start_keyframe', {}).get('description', '')[:50]}...")
 
         return video_scenarios
@@ -2730,15 +2953,12 @@ Also provide a brief French summary.""",
         same_day = global_scenario.get("same_day", True)
         title = global_scenario.get("title", "Reve")
 
-        video_scenarios = []
+        joined_palettes = {sid: self._join_palette(p) for sid, p in scene_palettes.items()}
 
-        for scene in scenes:
+        def _process(i, scene):
             scene_id = scene["id"]
             is_pov = scene.get("is_pov", False)
-
-            print(f"\n  [Scene {scene_id}] {scene.get('phase', scene.get('concept', ''))} {'(POV)' if is_pov else ''}")
-
-            palette = scene_palettes.get(scene_id, [])
+            palette = joined_palettes.get(scene_id, self._join_palette(None))
 
             if is_pov:
                 vs = self._generate_pov_scenario(scene, title, len(scenes), palette)
@@ -2750,16 +2970,37 @@ Also provide a brief French summary.""",
 
             vs["scene_id"] = scene_id
             vs["is_pov"] = is_pov
-            video_scenarios.append(vs)
+            return i, vs
 
+        video_scenarios = self._run_per_scene(_process, scenes)
+
+        for scene, vs in zip(scenes, video_scenarios):
+            print(f"\n  [Scene {scene['id']}] {scene.get('phase', scene.get('concept', ''))} {'(POV)' if scene.get('is_pov', False) else ''}")
             print(f"    > Start: {vs.get('start_keyframe', {}).get('description', '')[:50]}...")
 
         return video_scenarios
 
+    def _run_per_scene(self, process, scenes: List[Dict]) -> List[Dict]:
+        """Exécute process(i, scene) -> (i, result) en parallèle, résultats dans l'ordre des scènes."""
+        results = [None] * len(scenes)
+        if not scenes:
+            return results
+        with ThreadPoolExecutor(max_workers=len(scenes)) as executor:
+            futures = [executor.submit(process, i, s) for i, s in enumerate(scenes)]
+            for future in as_completed(futures):
+                idx, result = future.result()
+                results[idx] = result
+        return results
+
+    @staticmethod
+    def _join_palette(palette, default: str = "non definie") -> str:
+        return ", ".join(palette) if palette else default
+
     def _generate_standard_scenario(self, scene, title, total, name, gender, age, features, same_day, palette):
         outfit_instruction = "TENUE IDENTIQUE a la scene 1" if same_day else "Tenue peut etre differente"
 
-        prompt = PROMPT_SCENARIO_VIDEO.format(
+        prompt = render_template(
+            PROMPT_SCENARIO_VIDEO,
             strict_prefix=self.strict_prefix,
             dream_title=title,
             scene_id=scene["id"],
@@ -2774,18 +3015,18 @@ Also provide a brief French summary.""",
             character_features=features,
             has_character_b=scene.get("has_character_b", False),
             allows_camera_look=scene.get("allows_camera_look", False),
-            shot_types=", ".join(self.config.get("shot_types", [])),
-            camera_angles=", ".join(self.config.get("camera_angles", [])),
-            camera_movements=", ".join(self.config.get("camera_movements", [])),
-            lighting_directions=", ".join(self.config.get("lighting_directions", [])),
-            lighting_temperatures=", ".join(self.config.get("lighting_temperatures", [])),
-            depth_of_field_options=", ".join(self.config.get("depth_of_field_options", [])),
-            focus_options=", ".join(self.config.get("focus_options", [])),
-            scene_palette=", ".join(palette) if palette else "non definie",
+            shot_types=self._joined_options["shot_types"],
+            camera_angles=self._joined_options["camera_angles"],
+            camera_movements=self._joined_options["camera_movements"],
+            lighting_directions=self._joined_options["lighting_directions"],
+            lighting_temperatures=self._joined_options["lighting_temperatures"],
+            depth_of_field_options=self._joined_options["depth_of_field_options"],
+            focus_options=self._joined_options["focus_options"],
+            scene_palette=palette,
             same_day="Oui" if same_day else "Non",
             outfit_instruction=outfit_instruction,
-            expression_intensities=", ".join(self.config.get("expression_intensities", [])),
-            gaze_directions=", ".join(self.config.get("gaze_directions", [])),
+            expression_intensities=self._joined_options["expression_intensities"],
+            gaze_directions=self._joined_options["gaze_directions"],
             strict_suffix=self.strict_suffix
         )
 
@@ -2799,14 +3040,15 @@ Also provide a brief French summary.""",
         return self._parse_json(response)
 
     def _generate_pov_scenario(self, scene, title, total, palette):
-        prompt = PROMPT_SCENARIO_VIDEO_POV.format(
+        prompt = render_template(
+            PROMPT_SCENARIO_VIDEO_POV,
             strict_prefix=self.strict_prefix,
             scene_context=scene.get("context", scene.get("concept", "")),
             time_of_day=scene.get("time_of_day", "afternoon"),
             indoor_outdoor="interieur" if scene.get("indoor") else "exterieur",
-            scene_palette=", ".join(palette) if palette else "non definie",
-            depth_of_field_options=", ".join(self.config.get("depth_of_field_options", [])),
-            lighting_temperatures=", ".join(self.config.get("lighting_temperatures", [])),
+            scene_palette=palette,
+            depth_of_field_options=self._joined_options["depth_of_field_options"],
+            lighting_temperatures=self._joined_options["lighting_temperatures"],
             strict_suffix=self.strict_suffix
         )
 
@@ -2820,7 +3062,8 @@ Also provide a brief French summary.""",
         return self._parse_json(response)
 
     def _generate_pub_1a_scenario(self, scene, title, name, gender, age, features, daily_palette, dream_palette):
-        prompt = PROMPT_SCENARIO_PUB_VIDEO_1A.format(
+        prompt = render_template(
+            PROMPT_SCENARIO_PUB_VIDEO_1A,
             strict_prefix=self.strict_prefix,
             dream_title=title,
             character_name=name,
@@ -2845,7 +3088,8 @@ Also provide a brief French summary.""",
         return self._parse_json(response)
 
     def _generate_pub_1b_scenario(self, scene, title, name, gender, age, features, dream_palette):
-        prompt = PROMPT_SCENARIO_PUB_VIDEO_1B.format(
+        prompt = render_template(
+            PROMPT_SCENARIO_PUB_VIDEO_1B,
             strict_prefix=self.strict_prefix,
             dream_title=title,
             character_name=name,
@@ -2872,7 +3116,6 @@ Also provide a brief French summary.""",
     # =========================================================================
 
     def _mock_global(self, name, nb, nb_pov):
-        phases = ["PREPARATION", "DEPART", "DECOUVERTE", "ACTION", "CONNEXION", "ACCOMPLISSEMENT"]
         scenes = []
         pov_assigned = 0
         for i in range(nb):
@@ -2881,83 +3124,30 @@ Also provide a brief French summary.""",
                 pov_assigned += 1
             scenes.append({
                 "id": i + 1,
-                "phase": phases[i % len(phases)],
+                "phase": _MOCK_GLOBAL_PHASES[i % len(_MOCK_GLOBAL_PHASES)],
                 "context": f"Scene {i + 1}",
                 "emotional_beat": "Progression",
-                "time_of_day": ["morning", "midday", "golden_hour", "sunset"][i % 4],
+                "time_of_day": _MOCK_GLOBAL_TIMES[i % 4],
                 "indoor": i % 2 == 0,
                 "is_pov": is_pov
             })
         return {"title": f"Reve de {name}", "same_day": True, "scenes": scenes}
 
     def _mock_video_scenario(self, scene):
-        return {
-            "start_keyframe": {
+        return _fresh(
+            _MOCK_VIDEO_SCENARIO,
+            start_keyframe={
+                **_MOCK_VIDEO_SCENARIO["start_keyframe"],
                 "description": f"Debut scene {scene.get('id', 1)}",
-                "location": "Lieu",
-                "pose": "Pose initiale",
-                "expression": "Expression naturelle",
-                "expression_intensity": "moderate",
-                "gaze_direction": "away_left",
-                "outfit": "Tenue",
-                "accessories": ""
             },
-            "end_keyframe": {
-                "description": "Fin scene",
-                "pose": "Pose finale",
-                "expression": "Expression finale",
-                "expression_intensity": "moderate"
-            },
-            "action": "Action simple",
-            "shooting": {
-                "shot_type": "medium",
-                "camera_angle": "eye_level",
-                "camera_movement": "static",
-                "lighting_direction": "side",
-                "lighting_temperature": "warm",
-                "depth_of_field": "shallow",
-                "focus_on": "face"
-            }
-        }
+        )
 
     def _mock_pov_scenario(self, scene):
-        return {
-            "start_keyframe": {
-                "description": "Vue subjective",
-                "foreground": "Main tenant cafe",
-                "midground": "Horizon mer",
-                "background": "Ciel",
-                "lighting": "Lumiere doree"
-            },
-            "end_keyframe": {
-                "description": "Vue legerement changee",
-                "change": "Lumiere plus chaude"
-            },
-            "action": "Leger mouvement",
-            "shooting": {"depth_of_field": "shallow", "lighting_temperature": "warm"}
-        }
+        return _fresh(_MOCK_POV_SCENARIO)
 
     def _mock_pub_scenario(self, name, nb_dream):
-        scenes = [
-            {
-                "id": "1A", "type": "TRANSITION_AWAKENING",
-                "concept": "Du bureau au reve",
-                "daily_environment": "Bureau gris et morne",
-                "dream_environment": "Atelier lumineux",
-                "emotional_arc": "lassitude -> emerveillement",
-                "time_of_day": "morning", "indoor": True, "is_pov": False,
-                "allows_camera_look": False
-            },
-            {
-                "id": "1B", "type": "TRANSITION_ACTION",
-                "concept": "Premiers pas dans le reve",
-                "context": "Exploration de l'atelier",
-                "emotional_beat": "joie, curiosite",
-                "time_of_day": "morning", "indoor": False, "is_pov": False,
-                "allows_camera_look": False
-            },
-        ]
-        phases = ["ACTION", "ACTION", "IMMERSION", "ACTION", "INTERACTION", "ACTION", "ACCOMPLISSEMENT"]
+        scenes = [dict(s) for s in _MOCK_PUB_TRANSITION_SCENES]
+        phases = _MOCK_PUB_PHASES
         for i in range(nb_dream):
             is_last = i == nb_dream - 1
             scenes.append({
@@ -2967,78 +3157,19 @@ Also provide a brief French summary.""",
                 "concept": f"Scene de reve {i + 2}",
                 "context": f"Contexte scene {i + 2}",
                 "emotional_beat": "Joie",
-                "time_of_day": ["morning", "afternoon", "golden_hour", "sunset"][i % 4],
+                "time_of_day": _MOCK_PUB_TIMES[i % 4],
                 "indoor": i % 2 == 0,
                 "is_pov": False,
                 "has_character_b": False,
                 "allows_camera_look": is_last
             })
-        return {
-            "title": f"Pub reve de {name}",
-            "daily_context_description": "Bureau morne",
-            "daily_palette": ["#9E9E9E", "#BDBDBD", "#E0E0E0", "#F5F5F5"],
-            "dream_palette": ["#FF6B35", "#F7C59F", "#1A535C", "#4ECDC4"],
-            "character_b": {"present": False},
-            "scenes": scenes
-        }
+        return _fresh(_MOCK_PUB_SCENARIO, title=f"Pub reve de {name}", scenes=scenes)
 
     def _mock_pub_1a(self):
-        return {
-            "start_keyframe": {
-                "description": "Personnage dans bureau gris, face a droite, posture voutee",
-                "location": "Bureau open space terne",
-                "pose": "Face a droite, legerement voute, bras le long du corps",
-                "expression": "Lassitude, ennui",
-                "expression_intensity": "moderate",
-                "gaze_direction": "down",
-                "outfit": "Chemise grise, pantalon sombre",
-                "accessories": ""
-            },
-            "end_keyframe": {
-                "description": "Meme personnage dans atelier lumineux, tete relevee",
-                "location": "Atelier creatif lumineux",
-                "pose": "Tete relevee, corps redresse",
-                "expression": "Emerveillement, surprise joyeuse",
-                "expression_intensity": "moderate",
-                "gaze_direction": "up",
-                "outfit": "Meme chemise grise",
-                "accessories": ""
-            },
-            "action": "L'environnement se transforme du bureau gris a l'atelier lumineux",
-            "shooting": {
-                "shot_type": "medium_full", "camera_angle": "eye_level",
-                "camera_movement": "static", "lighting_direction": "front",
-                "lighting_temperature": "cool_to_warm", "depth_of_field": "medium",
-                "focus_on": "face"
-            }
-        }
+        return _fresh(_MOCK_PUB_1A)
 
     def _mock_pub_1b(self):
-        return {
-            "start_keyframe": {
-                "description": "Personnage emerveille dans atelier lumineux (= end 1A)",
-                "location": "Atelier creatif lumineux",
-                "pose": "Tete relevee, corps redresse",
-                "expression": "Emerveillement",
-                "expression_intensity": "moderate",
-                "gaze_direction": "up"
-            },
-            "end_keyframe": {
-                "description": "Personnage explorant l'atelier, tourne vers la gauche",
-                "location": "Atelier creatif lumineux",
-                "pose": "En mouvement, premier pas, orientation vers la gauche",
-                "expression": "Joie, curiosite",
-                "expression_intensity": "moderate",
-                "gaze_direction": "away_left"
-            },
-            "action": "Le personnage fait ses premiers pas dans le monde de reve",
-            "shooting": {
-                "shot_type": "medium_full", "camera_angle": "eye_level",
-                "camera_movement": "slow_pan_left", "lighting_direction": "side",
-                "lighting_temperature": "warm", "depth_of_field": "medium",
-                "focus_on": "full_body"
-            }
-        }
+        return _fresh(_MOCK_PUB_1B)
 
     # =========================================================================
     # COÛT
@@ -2,21 +2,72 @@
 Sublym v4 - Video Generator
 """
 
-import json
+import os
+import hashlib
 import base64
 import time
-import urllib.request
 import mimetypes
-from typing import Dict, Optional
+import shutil
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional
 from pathlib import Path
 
+from . import fast_json
 from .env_loader import get_api_key
+from .http_session import get_session
 from config.settings import DEFAULT_MODELS
-from prompts.templates import PROMPT_VIDEO, PROMPT_VIDEO_POV
+from prompts.templates import PROMPT_VIDEO, PROMPT_VIDEO_POV, render_template
+
+# Import conditionnel : upload vers le stockage fal.ai (sinon data URI base64)
+try:
+    import fal_client
+    FAL_CLIENT_AVAILABLE = True
+except ImportError:
+    FAL_CLIENT_AVAILABLE = False
 
 FAL_BASE_URL = "https://fal.run/"
 
 
+@lru_cache(maxsize=512)
+def _uploaded_url(path: str, mtime_ns: int) -> str:
+    """URL fal.ai d'une keyframe, uploadée une seule fois par (chemin, mtime).
+
+    Les retries vidéo et les keyframes partagées entre scènes réutilisent la même URL.
+    Un upload en échec lève une exception : rien n'est mis en cache, il sera retenté.
+    """
+    return fal_client.upload_file(path)
+
+
+def _data_uri(path: str) -> str:
+    """Data URI base64 (fallback, non mis en cache : plusieurs Mo par keyframe)."""
+    mime, _ = mimetypes.guess_type(path)
+    with open(path, "rb") as f:
+        data = base64.b64encode(f.read()).decode("utf-8")
+    return f"data:{mime or 'image/png'};base64,{data}"
+
+
+def _file_sha256(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def to_image_url(path: str) -> str:
+    """URL (https ou data URI) d'une image locale, invalidée si le fichier change."""
+    path = str(path)
+    if FAL_CLIENT_AVAILABLE:
+        try:
+            return _uploaded_url(path, os.stat(path).st_mtime_ns)
+        except Exception as e:
+            print(f"   [fal.ai] ⚠️ Upload échoué, fallback data URI: {e}")
+    return _data_uri(path)
+
+
 class VideoGenerator:
     """Génère les vidéos via fal.ai."""
 
@@ -28,7 +79,16 @@ class VideoGenerator:
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
         self.video_model = config.get("models", {}).get("video", DEFAULT_MODELS["video"])
+        self.max_concurrent = max(1, config.get("max_video_concurrent", 4))
+        self._api_key = None  # FAL_KEY résolue au premier appel réel (pas en dry run)
+
+        # Cache des vidéos déjà générées (même modèle + prompt + keyframes + durée)
+        self.cache_enabled = config.get("video_cache", True)
+        self.cache_dir = self.output_dir / ".video_cache"
+        self.cache_max_bytes = int(config.get("video_cache_max_gb", 5) * 1024 ** 3)
+        self.cache_max_age = config.get("video_cache_max_age_days", 30) * 86400
 
+        self._costs_lock = threading.Lock()
         self.costs_real = {"videos": 0, "duration_total": 0}
     
     def generate(self, start_image: str, end_image: str, action: str,
@@ -40,10 +100,10 @@ class VideoGenerator:
             return self._mock_generate(output_path)
 
         if is_pov:
-            prompt = PROMPT_VIDEO_POV.format(duration=duration, action=action)
+            prompt = render_template(PROMPT_VIDEO_POV, duration=duration, action=action)
         else:
-            prompt = PROMPT_VIDEO.format(
-                duration=duration, action=action,
+            prompt = render_template(
+                PROMPT_VIDEO, duration=duration, action=action,
                 camera_movement=camera_movement,
                 transition_path=transition_path or action
             )
@@ -51,45 +111,92 @@ class VideoGenerator:
         if self.verbose:
             print(f"\n--- PROMPT VIDEO ---\n{prompt}\n---")
         
-        return self._call_fal(prompt, start_image, end_image, output_path, duration)
+        cache_key = None
+        if self.cache_enabled:
+            cache_key = self._cache_key(prompt, start_image, end_image, duration)
+            cached = self._cache_lookup(cache_key, output_path)
+            if cached:
+                return cached
+
+        result = self._call_fal(prompt, start_image, end_image, output_path, duration)
+        if cache_key and result.get("success"):
+            self._cache_store(cache_key, result["video_path"])
+        return result
+
+    def generate_many(self, specs: List[Dict],
+                      on_done: Optional[Callable[[int, Dict], None]] = None) -> List[Dict]:
+        """Génère plusieurs vidéos en parallèle (scènes indépendantes).
+
+        Args:
+            specs: Liste de kwargs pour generate() (start_image, end_image, action, ...)
+            on_done: Appelé (index dans specs, résultat) dès qu'une vidéo se termine,
+                     depuis le thread appelant (progression par scène)
+
+        Returns:
+            Résultats dans l'ordre des specs
+        """
+        if not specs:
+            return []
+        results = [None] * len(specs)
+        if len(specs) == 1 or self.max_concurrent == 1:
+            for i, spec in enumerate(specs):
+                results[i] = self.generate(**spec)
+                if on_done:
+                    on_done(i, results[i])
+            return results
+
+        with ThreadPoolExecutor(max_workers=min(len(specs), self.max_concurrent)) as executor:
+            futures = {executor.submit(self.generate, **spec): i for i, spec in enumerate(specs)}
+            for future in as_completed(futures):
+                i = futures[future]
+                try:
+                    results[i] = future.result()
+                except Exception as e:
+                    results[i] = {"success": False, "error": str(e)}
+                if on_done:
+                    on_done(i, results[i])
+        return results
     
     def _call_fal(self, prompt, start_path, end_path, output_path, duration):
-        api_key = get_api_key("FAL_KEY")
-        
-        def to_data_uri(path):
-            mime, _ = mimetypes.guess_type(path)
-            with open(path, "rb") as f:
-                data = base64.b64encode(f.read()).decode("utf-8")
-            return f"data:{mime or 'image/png'};base64,{data}"
+        api_key = self._get_api_key()
         
         print(f"   [fal.ai] Génération vidéo...")
         
         payload = {
             "prompt": prompt,
-            "image_url": to_data_uri(start_path),
-            "end_image_url": to_data_uri(end_path),
+            "image_url": to_image_url(start_path),
+            "end_image_url": to_image_url(end_path),
             "prompt_optimizer": False
         }
 
-        req = urllib.request.Request(
-            f"{FAL_BASE_URL}{self.video_model}",
-            data=json.dumps(payload).encode("utf-8"),
-            headers={"Authorization": f"Key {api_key}", "Content-Type": "application/json"}
-        )
-        
+        session = get_session()
+
         try:
-            with urllib.request.urlopen(req, timeout=600) as response:
-                result = json.loads(response.read().decode("utf-8"))
+            response = session.post(
+                f"{FAL_BASE_URL}{self.video_model}",
+                data=fast_json.dumps(payload),
+                headers={"Authorization": f"Key {api_key}", "Content-Type": "application/json"},
+                timeout=600
+            )
+            response.raise_for_status()
+            result = fast_json.loads(response.content)
             
             video_url = result.get("video", {}).get("url")
             
             if video_url:
-                video_path = output_path or str(self.output_dir / f"video_{int(time.time())}.mp4")
+                video_path = output_path or self._default_video_path()
                 Path(video_path).parent.mkdir(parents=True, exist_ok=True)
-                urllib.request.urlretrieve(video_url, video_path)
+                # Ne jamais réécrire en place un fichier hardlinké depuis le cache
+                Path(video_path).unlink(missing_ok=True)
+                # Téléchargement en streaming (buffer 1 MiB) : mémoire constante quelle que soit la taille
+                with session.get(video_url, stream=True, timeout=600) as resp, open(video_path, "wb") as f:
+                    resp.raise_for_status()
+                    for chunk in resp.iter_content(chunk_size=1024 * 1024):
+                        f.write(chunk)
                 
-                self.costs_real["videos"] += 1
-                self.costs_real["duration_total"] += duration
+                with self._costs_lock:
+                    self.costs_real["videos"] += 1
+                    self.costs_real["duration_total"] += duration
                 
                 print(f"   [fal.ai] ✓ {video_path}")
                 return {"success": True, "video_path": video_path, "video_url": video_url}
@@ -100,6 +207,72 @@ class VideoGenerator:
             print(f"   [fal.ai] ❌ {e}")
             return {"success": False, "error": str(e)}
     
+    def _get_api_key(self) -> str:
+        if self._api_key is None:
+            self._api_key = get_api_key("FAL_KEY")
+        return self._api_key
+
+    def _default_video_path(self) -> str:
+        """Nom unique (deux vidéos dans la même seconde ne s'écrasent pas)."""
+        return str(self.output_dir / f"video_{int(time.time())}_{uuid.uuid4().hex[:8]}.mp4")
+
+    def _cache_key(self, prompt, start_path, end_path, duration) -> str:
+        parts = [self.video_model, prompt, _file_sha256(start_path), _file_sha256(end_path), str(duration)]
+        return hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()
+
+    def _cache_lookup(self, key, output_path) -> Optional[Dict]:
+        cached = self.cache_dir / f"{key}.mp4"
+        if not cached.exists():
+            return None
+
+        video_path = output_path or self._default_video_path()
+        Path(video_path).parent.mkdir(parents=True, exist_ok=True)
+        Path(video_path).unlink(missing_ok=True)
+        try:
+            os.link(cached, video_path)  # hardlink : aucun octet copié
+        except OSError:
+            shutil.copy2(cached, video_path)
+
+        try:
+            os.utime(cached)  # entrée récemment utilisée : évincée en dernier
+        except OSError:
+            pass
+        print(f"   [fal.ai] ♻️ Cache: {video_path}")
+        return {"success": True, "video_path": video_path, "cached": True}
+
+    def _cache_store(self, key, video_path):
+        cached = self.cache_dir / f"{key}.mp4"
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            if not cached.exists():
+                try:
+                    os.link(video_path, cached)
+                except OSError:
+                    shutil.copy2(video_path, cached)
+        except OSError as e:
+            print(f"   [fal.ai] ⚠️ Cache non écrit: {e}")
+        self._cache_prune()
+
+    def _cache_prune(self):
+        """Limite le cache : entrées trop vieilles, puis les plus anciennes au-delà de la taille max."""
+        try:
+            with os.scandir(self.cache_dir) as it:
+                entries = [(e.stat().st_mtime, e.stat().st_size, e.path)
+                           for e in it if e.is_file() and e.name.endswith(".mp4")]
+        except OSError:
+            return
+        entries.sort()
+        now = time.time()
+        total = sum(size for _, size, _ in entries)
+        for mtime, size, path in entries:
+            if now - mtime <= self.cache_max_age and total <= self.cache_max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+
     def _mock_generate(self, output_path):
         print(f"   [DRY RUN] Vidéo simulée")
         if output_path:
@@ -2,55 +2,574 @@
 Sublym v4 - Video Montage
 """
 
+import asyncio
+import json
+import os
+import shutil
 import subprocess
+import sys
+import tempfile
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import List, Optional
 from pathlib import Path
 
+from .logger import get_logger, flush_after
+
+# Import conditionnel pour la dépendance optionnelle
+try:
+    import av
+    AV_AVAILABLE = True
+except ImportError:
+    AV_AVAILABLE = False
+
+
+log = get_logger("sublym.montage")
+
+# Paramètres qui doivent être identiques pour que le demuxer concat accepte -c copy
+VIDEO_KEYS = ("codec_name", "width", "height", "pix_fmt", "time_base")
+AUDIO_KEYS = ("codec_name", "sample_rate", "channel_layout", "time_base")
+
+# Demuxer concat alimenté par stdin : pas de concat_list.txt partagé dans le dossier de sortie
+CONCAT_INPUT = ["-f", "concat", "-safe", "0", "-protocol_whitelist", "file,pipe", "-i", "pipe:0"]
+
+# Encodage de normalisation (montage en une passe ou segments parallèles)
+X264_ARGS = ["-c:v", "libx264", "-preset", "fast", "-crf", "23", "-pix_fmt", "yuv420p"]
+
+# Segments normalisés : mêmes fps/timescale/audio partout pour pouvoir les joindre en copie
+SEGMENT_FPS = "24"
+SEGMENT_ARGS = ["-r", SEGMENT_FPS, "-video_track_timescale", "90000",
+                "-c:a", "aac", "-ar", "48000", "-ac", "2", "-threads", "4"]
+
+# Encodeurs matériels par ordre de préférence : (nom, args avant -i, args de sortie)
+# Qualité constante calée sur -crf 23 de libx264 (cq nvenc, q:v videotoolbox sur 1-100)
+HW_ENCODERS = (
+    ("h264_nvenc", [], ["-c:v", "h264_nvenc", "-preset", "p4", "-tune", "hq",
+                        "-rc", "vbr", "-cq", "23", "-b:v", "0", "-pix_fmt", "yuv420p"]),
+    ("h264_videotoolbox", [], ["-c:v", "h264_videotoolbox", "-realtime", "1", "-q:v", "65",
+                               "-pix_fmt", "yuv420p"]),
+    ("h264_vaapi", ["-vaapi_device", "/dev/dri/renderD128"],
+     ["-vf", "format=nv12,hwupload", "-c:v", "h264_vaapi"]),
+)
+
+
+def _escape(path) -> str:
+    """Échappe les apostrophes pour une ligne file '...' du demuxer concat."""
+    return str(path).replace("'", "'\\''")
+
+
+def _concat_list(paths: List[str]) -> str:
+    """Liste du demuxer concat (chemins absolus : elle est lue depuis stdin, pas depuis un fichier)."""
+    return "".join(f"file '{_escape(os.path.abspath(p))}'\n" for p in paths)
+
+
+def _existing(paths: List[str]) -> List[str]:
+    """Filtre les chemins existants (un scandir par dossier au lieu d'un stat par fichier)."""
+    listings = {}
+    valid = []
+    for p in paths:
+        directory, name = os.path.split(str(p))
+        directory = directory or "."
+        if directory not in listings:
+            try:
+                with os.scandir(directory) as entries:
+                    listings[directory] = {e.name for e in entries if e.is_file()}
+            except OSError:
+                listings[directory] = None  # dossier illisible : stat individuel
+        names = listings[directory]
+        if (name in names) if names is not None else Path(p).exists():
+            valid.append(p)
+    return valid
+
+
+def _with_filter(encode_args: List[str], vf: str) -> List[str]:
+    """Args d'encodage avec vf placé avant un éventuel -vf propre à l'encodeur (vaapi)."""
+    args = list(encode_args)
+    if "-vf" in args:
+        i = args.index("-vf") + 1
+        args[i] = f"{vf},{args[i]}"
+        return args
+    return ["-vf", vf, *args]
+
+
+def _av_streams(path: str) -> Optional[List[dict]]:
+    """Flux d'un fichier lus via PyAV, aux mêmes clés/formats que ffprobe -show_streams."""
+    try:
+        with av.open(path) as container:
+            streams = []
+            for st in container.streams:
+                ctx = st.codec_context
+                if st.type == "video":
+                    streams.append({"codec_type": "video", "codec_name": ctx.name, "width": ctx.width,
+                                    "height": ctx.height, "pix_fmt": ctx.pix_fmt,
+                                    "time_base": str(st.time_base)})
+                elif st.type == "audio":
+                    streams.append({"codec_type": "audio", "codec_name": ctx.name,
+                                    "sample_rate": str(ctx.sample_rate),
+                                    "channel_layout": ctx.layout.name,
+                                    "time_base": str(st.time_base)})
+            return streams
+    except Exception:
+        return None
+
+
+@lru_cache(maxsize=1024)
+def _probe_duration(path: str, mtime_ns: int, size: int) -> float:
+    """Durée d'une vidéo en secondes.
+    
+    mtime_ns/size font partie de la clé : un fichier réécrit est re-sondé.
+    """
+    if AV_AVAILABLE:
+        # Lecture de l'en-tête du conteneur en process (pas de ffprobe)
+        try:
+            with av.open(path, metadata_errors="ignore") as container:
+                return float(container.duration) / av.time_base if container.duration else 0.0
+        except Exception:
+            pass
+    # Sondage limité d'abord (moov en tête : sorties +faststart), puis complet
+    for limits in (["-probesize", "32K", "-analyzeduration", "0", "-fflags", "+fastseek"], []):
+        try:
+            cmd = ["ffprobe", "-v", "error", *limits, "-show_entries", "format=duration",
+                   "-of", "default=noprint_wrappers=1:nokey=1", path]
+            result = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
+            duration = float(result.stdout.strip())
+            if duration > 0:
+                return duration
+        except:
+            continue
+    return 0
+
+
+@lru_cache(maxsize=1024)
+def _probe_signature(path: str, mtime_ns: int, size: int) -> Optional[tuple]:
+    """Paramètres des flux audio/vidéo (clés VIDEO_KEYS/AUDIO_KEYS), None si illisible.
+    
+    Même clé que _probe_duration : un fichier réécrit au même chemin est re-sondé.
+    """
+    streams = _av_streams(path) if AV_AVAILABLE else None
+    if streams is None:
+        try:
+            cmd = ["ffprobe", "-v", "error", "-show_streams", "-of", "json", path]
+            result = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
+            if result.returncode == 0:
+                streams = json.loads(result.stdout).get("streams", [])
+        except Exception:
+            streams = None
+    if streams is None:
+        return None
+    return tuple(
+        (s.get("codec_type"),) + tuple(
+            s.get(k) for k in (VIDEO_KEYS if s.get("codec_type") == "video" else AUDIO_KEYS)
+        )
+        for s in streams if s.get("codec_type") in ("video", "audio")
+    )
+
 
 class VideoMontage:
     """Assemble les vidéos via ffmpeg."""
     
-    def __init__(self, verbose: bool = False):
+    _hw_encoder = None  # détecté une fois par process (voir _detect_hw_encoder)
+    _hw_detected = False
+    _hw_lock = threading.Lock()
+    
+    def __init__(self, verbose: bool = False, parallel: bool = True, hw_accel: bool = True):
         self.verbose = verbose
+        self.parallel = parallel  # ré-encodage segment par segment en parallèle si copie impossible
+        self.hw_accel = hw_accel  # encodeur matériel détecté au premier ré-encodage seulement
     
-    def concat(self, video_paths: List[str], output_path: str, timeout: int = 120) -> dict:
+    @flush_after
+    def concat(self, video_paths: List[str], output_path: str, timeout: int = 120,
+               max_parallel: int = max(1, (os.cpu_count() or 1) // 4)) -> dict:
+        out = Path(output_path)
+        prepared = self._prepare(video_paths, out)
+        if isinstance(prepared, dict):
+            return prepared
+        valid = prepared
+        copy_cmd = self._copy_cmd(out)
+        
+        if self._streams_compatible(valid):
+            # Même codec/params partout : copie des paquets, pas de ré-encodage
+            log.info(f"   [ffmpeg] Montage {len(valid)} vidéos (copy)...")
+            result = self._run(copy_cmd, output_path, timeout, _concat_list(valid))
+            if result["success"]:
+                return result
+            # Le demuxer concat MP4 bute souvent sur les discontinuités de PTS
+            if len(valid) > 1 and self._ts_eligible(valid):
+                log.info("   [ffmpeg] Copie MP4 en échec, passage par MPEG-TS...")
+                result = self.concat_ts(valid, output_path, timeout, max_parallel)
+                if result["success"]:
+                    return result
+            log.info("   [ffmpeg] Copie en échec, ré-encodage...")
+        
+        tmp_dir = None
+        try:
+            size = self._video_size(valid[0]) if self.parallel and len(valid) > 1 else None
+            if size:
+                tmp_dir = Path(tempfile.mkdtemp(prefix=".montage_", dir=out.parent.resolve()))
+                log.info(f"   [ffmpeg] Normalisation {len(valid)} vidéos {size[0]}x{size[1]} (x{max_parallel})...")
+                segments = self._normalize_parallel(valid, tmp_dir, size, timeout, max_parallel)
+                # Joindre en copie seulement si la normalisation a bien aligné les flux
+                if segments and self._streams_compatible(segments):
+                    log.info(f"   [ffmpeg] Montage {len(segments)} segments (copy)...")
+                    result = self._run(copy_cmd, output_path, timeout, _concat_list(segments))
+                    if result["success"]:
+                        return result
+            
+            log.info(f"   [ffmpeg] Montage {len(valid)} vidéos ({self._encoder_name()})...")
+            return self._run(self._encode_cmd(out), output_path, timeout, _concat_list(valid))
+        finally:
+            if tmp_dir:
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+    
+    @flush_after
+    def concat_ts(self, video_paths: List[str], output_path: str, timeout: int = 120,
+                  max_parallel: int = max(1, (os.cpu_count() or 1) // 4)) -> dict:
+        """Concat sans ré-encodage via intermédiaires MPEG-TS (H.264).
+        
+        Chaque entrée est remuxée en TS (copie, annexb) en parallèle, puis les TS
+        sont joints par le protocole concat: qui ignore les sauts de PTS.
+        """
         if not video_paths:
             return {"success": False, "error": "No videos"}
         
-        valid = [p for p in video_paths if Path(p).exists()]
+        valid = _existing(video_paths)
         if not valid:
             return {"success": False, "error": "No valid videos"}
         
-        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+        out = Path(output_path)
+        out.parent.mkdir(parents=True, exist_ok=True)
         
-        list_file = Path(output_path).parent / "concat_list.txt"
-        with open(list_file, "w") as f:
-            for vp in valid:
-                f.write(f"file '{vp}'\n")
+        tmp_dir = Path(tempfile.mkdtemp(prefix=".montage_ts_", dir=out.parent.resolve()))
+        try:
+            parts = [tmp_dir / f"{i}.ts" for i in range(len(valid))]
+            jobs = [
+                (["ffmpeg", "-y", "-i", str(src), "-c", "copy", "-bsf:v", "h264_mp4toannexb",
+                  "-f", "mpegts", str(ts)], ts)
+                for src, ts in zip(valid, parts)
+            ]
+            log.info(f"   [ffmpeg] Remux TS {len(valid)} vidéos (x{max_parallel})...")
+            if not self._exec_all(jobs, timeout, max_parallel):
+                return {"success": False, "error": "MPEG-TS remux failed"}
+            
+            cmd = ["ffmpeg", "-y", "-i", "concat:" + "|".join(str(ts) for ts in parts),
+                   "-c", "copy", "-bsf:a", "aac_adtstoasc", "-movflags", "+faststart", str(out)]
+            log.info(f"   [ffmpeg] Montage {len(parts)} segments TS (copy)...")
+            return self._run(cmd, output_path, timeout)
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+    
+    @flush_after
+    async def concat_async(self, video_paths: List[str], output_path: str, timeout: int = 120,
+                           max_parallel: int = max(1, (os.cpu_count() or 1) // 4)) -> dict:
+        """Comme concat, sans bloquer la boucle asyncio pendant ffmpeg.
         
-        cmd = ["ffmpeg", "-y", "-f", "concat", "-safe", "0", "-i", str(list_file),
-               "-c:v", "libx264", "-preset", "fast", "-crf", "23", "-pix_fmt", "yuv420p", str(output_path)]
+        Mêmes étapes que concat ; les ffprobe et le repli MPEG-TS passent par un thread.
+        """
+        out = Path(output_path)
+        prepared = self._prepare(video_paths, out)
+        if isinstance(prepared, dict):
+            return prepared
+        valid = prepared
+        copy_cmd = self._copy_cmd(out)
         
-        print(f"   [ffmpeg] Montage {len(valid)} vidéos...")
+        if await asyncio.to_thread(self._streams_compatible, valid):
+            log.info(f"   [ffmpeg] Montage {len(valid)} vidéos (copy)...")
+            result = await self._run_async(copy_cmd, output_path, timeout, _concat_list(valid))
+            if result["success"]:
+                return result
+            if len(valid) > 1 and await asyncio.to_thread(self._ts_eligible, valid):
+                log.info("   [ffmpeg] Copie MP4 en échec, passage par MPEG-TS...")
+                result = await asyncio.to_thread(self.concat_ts, valid, output_path, timeout, max_parallel)
+                if result["success"]:
+                    return result
+            log.info("   [ffmpeg] Copie en échec, ré-encodage...")
         
+        tmp_dir = None
         try:
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
-            if result.returncode == 0 and Path(output_path).exists():
-                duration = self._get_duration(output_path)
-                print(f"   [ffmpeg] ✓ {output_path} ({duration:.1f}s)")
-                return {"success": True, "output_path": output_path, "duration": duration}
-            return {"success": False, "error": result.stderr[:200]}
+            size = None
+            if self.parallel and len(valid) > 1:
+                size = await asyncio.to_thread(self._video_size, valid[0])
+            if size:
+                await asyncio.to_thread(self._hw_enc)  # détection éventuelle hors boucle
+                tmp_dir = Path(tempfile.mkdtemp(prefix=".montage_", dir=out.parent.resolve()))
+                log.info(f"   [ffmpeg] Normalisation {len(valid)} vidéos {size[0]}x{size[1]} (x{max_parallel})...")
+                semaphore = asyncio.Semaphore(max_parallel)
+                
+                async def encode(i: int, src: str) -> bool:
+                    seg = tmp_dir / f"seg_{i}.mp4"
+                    async with semaphore:
+                        try:
+                            returncode, _ = await self._exec_async(self._segment_cmd(src, seg, size), timeout)
+                            return returncode == 0 and seg.exists()
+                        except Exception:
+                            return False
+                
+                ok = await asyncio.gather(*(encode(i, src) for i, src in enumerate(valid)))
+                segments = [str(tmp_dir / f"seg_{i}.mp4") for i in range(len(valid))]
+                if all(ok) and await asyncio.to_thread(self._streams_compatible, segments):
+                    log.info(f"   [ffmpeg] Montage {len(valid)} segments (copy)...")
+                    result = await self._run_async(copy_cmd, output_path, timeout, _concat_list(segments))
+                    if result["success"]:
+                        return result
+            
+            encoder = await asyncio.to_thread(self._encoder_name)
+            log.info(f"   [ffmpeg] Montage {len(valid)} vidéos ({encoder})...")
+            return await self._run_async(self._encode_cmd(out), output_path, timeout, _concat_list(valid))
+        finally:
+            if tmp_dir:
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+    
+    def _prepare(self, video_paths: List[str], out: Path):
+        """Filtre les entrées et crée le dossier de sortie. Retourne valid ou un dict d'erreur."""
+        if not video_paths:
+            return {"success": False, "error": "No videos"}
+        
+        valid = _existing(video_paths)
+        if not valid:
+            return {"success": False, "error": "No valid videos"}
+        
+        out.parent.mkdir(parents=True, exist_ok=True)
+        return valid
+    
+    def _copy_cmd(self, out: Path) -> List[str]:
+        return ["ffmpeg", "-y", *CONCAT_INPUT, "-c", "copy", "-movflags", "+faststart", str(out)]
+    
+    def _encode_cmd(self, out: Path) -> List[str]:
+        input_args, encode_args = self._encode_args()
+        return ["ffmpeg", "-y", *input_args, *CONCAT_INPUT, *encode_args, str(out)]
+    
+    def _segment_cmd(self, src: str, seg: Path, size: tuple) -> List[str]:
+        """Segment au format de sortie commun : WxH (scale+pad), fps, timescale et audio fixes."""
+        input_args, encode_args = self._encode_args()
+        w, h = size
+        vf = (f"scale={w}:{h}:force_original_aspect_ratio=decrease,"
+              f"pad={w}:{h}:(ow-iw)/2:(oh-ih)/2,setsar=1")
+        return ["ffmpeg", "-y", *input_args, "-i", str(src), *_with_filter(encode_args, vf),
+                *SEGMENT_ARGS, str(seg)]
+    
+    def _run(self, cmd: List[str], output_path: str, timeout: int, stdin_data: str = None) -> dict:
+        try:
+            returncode, stderr_tail = self._exec(cmd, timeout, stdin_data)
+            return self._result(returncode, stderr_tail, output_path)
         except Exception as e:
             return {"success": False, "error": str(e)}
     
+    async def _run_async(self, cmd: List[str], output_path: str, timeout: int,
+                         stdin_data: str = None) -> dict:
+        try:
+            returncode, stderr_tail = await self._exec_async(cmd, timeout, stdin_data)
+            return await asyncio.to_thread(self._result, returncode, stderr_tail, output_path)
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+    
+    def _result(self, returncode: int, stderr_tail: str, output_path: str) -> dict:
+        if returncode == 0 and os.path.exists(output_path):
+            duration = self._get_duration(output_path)
+            log.info(f"   [ffmpeg] ✓ {output_path} ({duration:.1f}s)")
+            return {"success": True, "output_path": output_path, "duration": duration}
+        return {"success": False, "error": stderr_tail[-200:]}
+    
+    def _exec(self, cmd: List[str], timeout: int, stdin_data: str = None):
+        """Lance ffmpeg en lisant stderr au fil de l'eau.
+        
+        Seules les 40 dernières lignes sont gardées (la progression par frame
+        n'est pas accumulée en mémoire). stdin_data : liste concat envoyée sur
+        pipe:0. Retourne (returncode, fin de stderr).
+        """
+        tail = deque(maxlen=40)
+        proc = subprocess.Popen(cmd, stdin=subprocess.PIPE if stdin_data is not None else subprocess.DEVNULL,
+                                stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                                text=True, bufsize=1)
+        timed_out = threading.Event()
+        
+        def kill():
+            timed_out.set()
+            proc.kill()
+        
+        timer = threading.Timer(timeout, kill)
+        timer.start()
+        try:
+            if stdin_data is not None:
+                try:
+                    proc.stdin.write(stdin_data)
+                    proc.stdin.close()
+                except BrokenPipeError:
+                    pass  # ffmpeg déjà sorti : l'erreur est dans stderr
+            for line in proc.stderr:
+                tail.append(line)
+                if self.verbose:
+                    # Écho direct sur stderr : pas d'attente du flush du logger bufferisé
+                    sys.stderr.write(line)
+                    sys.stderr.flush()
+            returncode = proc.wait()
+        finally:
+            timer.cancel()
+            proc.stderr.close()
+        if timed_out.is_set():
+            raise subprocess.TimeoutExpired(cmd, timeout)
+        return returncode, "".join(tail)
+    
+    async def _exec_async(self, cmd: List[str], timeout: int, stdin_data: str = None):
+        """Version asyncio de _exec (stderr lu par blocs : la progression ffmpeg finit en \\r)."""
+        tail = deque(maxlen=40)
+        proc = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdin=asyncio.subprocess.PIPE if stdin_data is not None else asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.PIPE,
+        )
+        
+        async def drain():
+            if stdin_data is not None:
+                try:
+                    proc.stdin.write(stdin_data.encode("utf-8"))
+                    await proc.stdin.drain()
+                    proc.stdin.close()
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+            while True:
+                chunk = await proc.stderr.read(4096)
+                if not chunk:
+                    break
+                text = chunk.decode("utf-8", errors="replace")
+                tail.append(text)
+                if self.verbose:
+                    sys.stderr.write(text)
+                    sys.stderr.flush()
+            return await proc.wait()
+        
+        try:
+            returncode = await asyncio.wait_for(drain(), timeout)
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+            raise subprocess.TimeoutExpired(cmd, timeout)
+        return returncode, "".join(tail)
+    
+    def _normalize_parallel(self, paths: List[str], tmp_dir: Path, size: tuple, timeout: int,
+                            max_parallel: int) -> Optional[List[str]]:
+        """Ré-encode chaque vidéo en segment H.264 normalisé (format size), en parallèle.
+        
+        Retourne les segments dans l'ordre, ou None si un encodage échoue.
+        """
+        segments = [tmp_dir / f"seg_{i}.mp4" for i in range(len(paths))]
+        jobs = [(self._segment_cmd(src, seg, size), seg) for src, seg in zip(paths, segments)]
+        if not self._exec_all(jobs, timeout, max_parallel):
+            return None
+        return [str(seg) for seg in segments]
+    
+    def _exec_all(self, jobs: List[tuple], timeout: int, max_parallel: int) -> bool:
+        """Exécute des commandes (cmd, fichier produit) en parallèle. True si toutes réussissent."""
+        def run(job) -> bool:
+            cmd, produced = job
+            try:
+                returncode, _ = self._exec(cmd, timeout)
+                return returncode == 0 and produced.exists()
+            except Exception:
+                return False
+        
+        with ThreadPoolExecutor(max_workers=max_parallel) as executor:
+            return all(list(executor.map(run, jobs)))
+    
     def get_real_cost(self) -> float:
         return 0.0  # ffmpeg = gratuit
 
+    def _hw_enc(self) -> Optional[tuple]:
+        """Encodeur matériel retenu ; détection lancée au premier besoin (pas en copie/dry run)."""
+        return self._detect_hw_encoder() if self.hw_accel else None
+
+    def _encoder_name(self) -> str:
+        enc = self._hw_enc()
+        return enc[0] if enc else "libx264"
+
+    def _encode_args(self):
+        """(args avant -i, args d'encodage) : encodeur matériel si dispo, sinon libx264."""
+        enc = self._hw_enc()
+        if enc:
+            return enc[1], enc[2]
+        return [], X264_ARGS
+
+    @classmethod
+    def _detect_hw_encoder(cls) -> Optional[tuple]:
+        """Premier encodeur H.264 matériel utilisable (résultat gardé au niveau de la classe).
+        
+        Un encodeur compilé dans ffmpeg n'implique pas le matériel présent :
+        chaque candidat listé est validé par un encodage d'essai de quelques frames.
+        """
+        with cls._hw_lock:
+            if not cls._hw_detected:
+                cls._hw_encoder = cls._probe_hw_encoder()
+                cls._hw_detected = True
+        return cls._hw_encoder
+
+    @staticmethod
+    def _probe_hw_encoder() -> Optional[tuple]:
+        try:
+            result = subprocess.run(["ffmpeg", "-hide_banner", "-encoders"],
+                                    capture_output=True, text=True, timeout=10)
+        except Exception:
+            return None
+        for name, input_args, encode_args in HW_ENCODERS:
+            if name not in result.stdout:
+                continue
+            cmd = ["ffmpeg", "-hide_banner", "-y", *input_args, "-f", "lavfi",
+                   "-i", "color=c=black:s=256x256:d=0.2", *encode_args, "-f", "null", "-"]
+            try:
+                trial = subprocess.run(cmd, capture_output=True, text=True, timeout=15)
+            except Exception:
+                continue
+            if trial.returncode == 0:
+                return name, input_args, encode_args
+        return None
+
+    def _streams_compatible(self, paths: List[str]) -> bool:
+        """True si toutes les vidéos ont les mêmes flux (concat -c copy possible)."""
+        signatures = self._probe_all(paths)
+        if any(sig is None for sig in signatures):
+            return False
+        return all(sig == signatures[0] for sig in signatures[1:])
+
+    def _ts_eligible(self, paths: List[str]) -> bool:
+        """True si le remux MPEG-TS (h264_mp4toannexb) s'applique : vidéo H.264, audio AAC."""
+        codecs = {"video": "h264", "audio": "aac"}
+        signatures = self._probe_all(paths)
+        return all(
+            sig is not None and all(stream[1] == codecs[stream[0]] for stream in sig)
+            for sig in signatures
+        )
+
+    def _probe_all(self, paths: List[str]) -> List[Optional[tuple]]:
+        """Signatures de flux de toutes les entrées, sondées en une passe.
+        
+        ffprobe n'accepte qu'un fichier par appel (et -f concat ne décrit que le
+        premier) : avec PyAV tout est lu en process, sinon les ffprobe sont
+        lancés en parallèle plutôt qu'à la suite (les entrées en cache reviennent aussitôt).
+        """
+        keys = [str(p) for p in paths]
+        if len(keys) > 1 and not AV_AVAILABLE:
+            with ThreadPoolExecutor(max_workers=min(8, len(keys))) as executor:
+                return list(executor.map(self._stream_signature, keys))
+        return [self._stream_signature(k) for k in keys]
+
+    def _stream_signature(self, path) -> Optional[tuple]:
+        """Paramètres des flux audio/vidéo d'un fichier (PyAV ou ffprobe, mis en cache)."""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return _probe_signature(str(path), st.st_mtime_ns, st.st_size)
+
+    def _video_size(self, path) -> Optional[tuple]:
+        """(largeur, hauteur) du premier flux vidéo, None si inconnu."""
+        for stream in self._stream_signature(path) or ():
+            if stream[0] == "video" and stream[2] and stream[3]:
+                return int(stream[2]), int(stream[3])
+        return None
+
     def _get_duration(self, path):
         try:
-            cmd = ["ffprobe", "-v", "error", "-show_entries", "format=duration",
-                   "-of", "default=noprint_wrappers=1:nokey=1", str(path)]
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
-            return float(result.stdout.strip()) if result.stdout.strip() else 0
-        except:
+            st = os.stat(path)
+        except OSError:
             return 0
+        return _probe_duration(str(path), st.st_mtime_ns, st.st_size)
@@ -7,16 +7,33 @@ TOUTE LA CONFIGURATION EST ICI
 import os
 import sys
 from pathlib import Path
+from types import MappingProxyType
 
 sys.path.insert(0, str(Path(__file__).parent))
 
 from pipeline import DreamPipeline
 from config.settings import PRESETS
+from services.logger import get_logger, flush_logs
+
+log = get_logger("sublym.test")
 
 CHARACTER_NAME = "Julien"
 CHARACTER_GENDER = "male"
 
-# Photos de Julien
+IMAGE_EXTENSIONS = frozenset({".jpg", ".jpeg", ".png", ".webp"})
+
+
+def scan_photos(directory) -> list:
+    """Photos d'un dossier, triées (un seul scandir, sans stat par fichier)."""
+    with os.scandir(directory) as it:
+        return sorted(
+            e.path for e in it
+            if e.is_file() and not e.name.startswith(".")
+            and os.path.splitext(e.name)[1].lower() in IMAGE_EXTENSIONS
+        )
+
+
+# Photos de Julien (liste vide = toutes les photos de USER_PHOTOS_DIR)
 JULIEN_PHOTOS_DIR = Path("/Users/nathalie/Dropbox/____BIG_BOFF___/PROJETS/PRO/SUBLYM_APP_PUB/Avatars/Julien36/Julien")
 USER_PHOTOS = [
     str(JULIEN_PHOTOS_DIR / "Julien_laughing.png"),
@@ -39,16 +56,16 @@ IMPOSED_SCENES = None
 CUSTOM_PALETTE = None
 PALETTE_MUST_COMPLEMENT_SKIN = True
 
-SHOT_TYPES = ["close_up", "medium", "medium_full", "full", "wide", "profile", "back_three_quarter", "far"]
-CAMERA_ANGLES = ["eye_level", "low_angle", "high_angle"]
-CAMERA_MOVEMENTS = ["static", "slow_pan_left", "slow_pan_right", "slow_zoom_in", "slow_zoom_out", "tracking"]
-LIGHTING_DIRECTIONS = ["front", "side", "back", "rim"]
-LIGHTING_TEMPERATURES = ["warm", "neutral", "cool"]
-DEPTH_OF_FIELD_OPTIONS = ["shallow", "medium", "deep"]
-FOCUS_OPTIONS = ["face", "eyes", "full_body", "foreground_object"]
+SHOT_TYPES = ("close_up", "medium", "medium_full", "full", "wide", "profile", "back_three_quarter", "far")
+CAMERA_ANGLES = ("eye_level", "low_angle", "high_angle")
+CAMERA_MOVEMENTS = ("static", "slow_pan_left", "slow_pan_right", "slow_zoom_in", "slow_zoom_out", "tracking")
+LIGHTING_DIRECTIONS = ("front", "side", "back", "rim")
+LIGHTING_TEMPERATURES = ("warm", "neutral", "cool")
+DEPTH_OF_FIELD_OPTIONS = ("shallow", "medium", "deep")
+FOCUS_OPTIONS = ("face", "eyes", "full_body", "foreground_object")
 
-EXPRESSION_INTENSITIES = ["subtle", "moderate", "pronounced"]
-GAZE_DIRECTIONS = ["away_left", "away_right", "down", "up", "distant", "at_object"]
+EXPRESSION_INTENSITIES = ("subtle", "moderate", "pronounced")
+GAZE_DIRECTIONS = ("away_left", "away_right", "down", "up", "distant", "at_object")
 
 VALIDATION_CONFIG = {
     "face_shape": {"min": 0.8, "ref": "user_photo", "label": "Forme du visage IDENTIQUE"},
@@ -92,17 +109,22 @@ VALIDATION_CONFIG = {
     "no_deformation": {"min": 0.9, "ref": "none", "label": "Aucune déformation"},
     "action_match": {"min": 0.7, "ref": "pitch", "label": "Action correspond"},
 }
+# ref/label partagés entre critères ; table figée (lue par le pipeline, jamais modifiée)
+for _criterion in VALIDATION_CONFIG.values():
+    _criterion["ref"] = sys.intern(_criterion["ref"])
+    _criterion["label"] = sys.intern(_criterion["label"])
+VALIDATION_CONFIG = MappingProxyType(VALIDATION_CONFIG)
 
 GLOBAL_MIN_SCORE = 0.75
 MAX_ATTEMPTS = 5
 
-MODELS = {
+MODELS = MappingProxyType({
     "scenario": "gpt-4o",
     "scenario_validation": "gpt-4o-mini",
     "image": "gemini-3-pro-image-preview",
     "vision": "gemini-2.5-flash",  # Validation visuelle (tenue, accessoires, action, décor)
     "video": "fal-ai/minimax/hailuo-02/standard/image-to-video",
-}
+})
 
 PROMPT_STRICT_PREFIX = ""
 PROMPT_STRICT_SUFFIX = ""
@@ -136,14 +158,18 @@ SCENARIO_JSON = None  # Pas de scénario existant — régénérer
 
 if __name__ == "__main__":
     if not USER_PHOTOS_DIR.exists():
-        print(f"❌ Répertoire non trouvé: {USER_PHOTOS_DIR}")
+        log.info(f"❌ Répertoire non trouvé: {USER_PHOTOS_DIR}")
         sys.exit(1)
 
     if not USER_PHOTOS:
-        print(f"❌ Aucune photo dans: {USER_PHOTOS_DIR}")
+        USER_PHOTOS = scan_photos(USER_PHOTOS_DIR)
+
+    if not USER_PHOTOS:
+        log.info(f"❌ Aucune photo dans: {USER_PHOTOS_DIR}")
         sys.exit(1)
 
-    print(f"📷 {len(USER_PHOTOS)} photos")
+    log.info(f"📷 {len(USER_PHOTOS)} photos")
+    flush_logs()  # avant les print du pipeline
 
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
@@ -228,23 +254,24 @@ if __name__ == "__main__":
         scenario_json=SCENARIO_JSON,
     )
 
-    print("\n" + "=" * 70)
+    log.info("\n" + "=" * 70)
     if results.get("success"):
-        print("🎉 Terminé avec succès!")
+        log.info("🎉 Terminé avec succès!")
     else:
-        print("⚠️ Terminé avec des problèmes")
+        log.info("⚠️ Terminé avec des problèmes")
 
     if results.get("final_video_avant"):
-        print(f"\n🎬 Montage AVANT: {results['final_video_avant']}")
+        log.info(f"\n🎬 Montage AVANT: {results['final_video_avant']}")
     if results.get("final_video_apres"):
-        print(f"🎬 Montage APRÈS: {results['final_video_apres']}")
+        log.info(f"🎬 Montage APRÈS: {results['final_video_apres']}")
     if results.get("final_video"):
-        print(f"🎬 Vidéo finale: {results['final_video']}")
+        log.info(f"🎬 Vidéo finale: {results['final_video']}")
 
     if results.get("costs_real"):
-        print(f"\n💰 COÛTS RÉELS:")
+        log.info(f"\n💰 COÛTS RÉELS:")
         for service, cost in results["costs_real"].items():
-            print(f"   - {service}: {cost:.4f}€")
-        print(f"   TOTAL: {sum(results['costs_real'].values()):.4f}€")
+            log.info(f"   - {service}: {cost:.4f}€")
+        log.info(f"   TOTAL: {sum(results['costs_real'].values()):.4f}€")
 
+    flush_logs()
     sys.exit(0 if results.get("success") else 1)
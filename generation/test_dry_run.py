@@ -2,151 +2,151 @@
 """
 Sublym v4 - Test Dry Run
 Vérifie que le pipeline s'exécute sans erreur (aucun appel API).
+
+    pytest generation/test_dry_run.py
 """
 
+import base64
+import os
 import sys
-import tempfile
 import shutil
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
+from types import MappingProxyType
+
+import pytest
 
 sys.path.insert(0, str(Path(__file__).parent))
 
 from pipeline import DreamPipeline
 from config.settings import PRESETS, DEFAULT_CONFIG
+from testutils import VERBOSE
+
+# Photo factice (1x1 PNG), décodée une fois
+PIXEL_PNG = base64.b64decode(
+    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNk+M9QDwADhgGAWjR9awAAAABJRU5ErkJggg=="
+)
+
+EXPECTED_FULL_STEPS = frozenset({
+    "analyze_character", "extract_dream_elements", "generate_palette", "generate_scenario",
+    "generate_scenes", "generate_keyframes", "generate_videos",
+})
+EXPECTED_SCENARIO_ONLY_NOT = frozenset({"generate_keyframes", "generate_videos"})
+
+DREAM = "Je rêve de vivre au bord de la mer, dans une maison lumineuse avec une terrasse face à l'océan."
+
+
+def make_photos(photos_dir: Path) -> list:
+    """Crée 3 fausses photos : une écrite, les autres liées (chemins distincts)."""
+    first = photos_dir / "photo_1.png"
+    first.write_bytes(PIXEL_PNG)
+    fake_photos = [str(first)]
+    for i in range(2, 4):
+        p = photos_dir / f"photo_{i}.png"
+        try:
+            os.link(first, p)
+        except OSError:
+            shutil.copyfile(first, p)
+        fake_photos.append(str(p))
+    return fake_photos
 
 
-def run_dry_test():
-    """Test complet du pipeline en dry_run."""
+# Config de base, fusionnée une seule fois (lecture seule)
+_BASE_CONFIG = MappingProxyType({
+    **DEFAULT_CONFIG,
+    "nb_scenes": 3,
+    "nb_pov_scenes": 1,
+    "mode": "scenario",
+    "prompt_strict_prefix": "TEST PREFIX",
+    "prompt_strict_suffix": "TEST SUFFIX",
+})
 
-    # Créer des photos factices
-    tmp_dir = Path(tempfile.mkdtemp(prefix="sublym_test_"))
-    photos_dir = tmp_dir / "photos"
-    photos_dir.mkdir()
-    output_dir = tmp_dir / "output"
 
-    # Créer 3 fausses photos (1x1 PNG)
-    import base64
-    pixel_png = base64.b64decode(
-        "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNk+M9QDwADhgGAWjR9awAAAABJRU5ErkJggg=="
-    )
-    fake_photos = []
-    for i in range(3):
-        p = photos_dir / f"photo_{i+1}.png"
-        p.write_bytes(pixel_png)
-        fake_photos.append(str(p))
+def make_config(**overrides) -> dict:
+    """Copie de _BASE_CONFIG avec surcharges."""
+    config = dict(_BASE_CONFIG)
+    config.update(overrides)
+    return config
 
-    dream = "Je rêve de vivre au bord de la mer, dans une maison lumineuse avec une terrasse face à l'océan."
-
-    # Config complète basée sur DEFAULT_CONFIG
-    config = dict(DEFAULT_CONFIG)
-    config.update({
-        "nb_scenes": 3,
-        "nb_pov_scenes": 1,
-        "mode": "scenario",
-        "prompt_strict_prefix": "TEST PREFIX",
-        "prompt_strict_suffix": "TEST SUFFIX",
-    })
-
-    print("=" * 70)
-    print("TEST DRY RUN - Sublym v4")
-    print("=" * 70)
-    print(f"Photos: {len(fake_photos)}")
-    print(f"Config keys: {len(config)}")
-    print(f"Output: {output_dir}")
-    print()
-
-    # Test 1: Pipeline full
-    print("\n>>> TEST 1: Pipeline FULL (dry_run)")
-    pipeline = DreamPipeline(
-        output_dir=str(output_dir),
-        dry_run=True,
-        verbose=False,
-        config=config
-    )
 
-    results = pipeline.run(
-        steps=dict(PRESETS["full"]),
-        dream_statement=dream,
-        user_photos=fake_photos,
-        character_name="TestUser",
-        character_gender="female",
-    )
+@pytest.fixture(scope="session")
+def fake_photos(tmp_path_factory) -> list:
+    """Photos écrites une seule fois pour toute la session."""
+    return make_photos(tmp_path_factory.mktemp("photos"))
 
-    assert results.get("success"), f"Pipeline full failed: {results.get('errors')}"
-    assert "analyze_character" in results["steps_executed"]
-    assert "extract_dream_elements" in results["steps_executed"]
-    assert "generate_palette" in results["steps_executed"]
-    assert "generate_scenario" in results["steps_executed"]
-    assert "generate_scenes" in results["steps_executed"]
-    assert "generate_keyframes" in results["steps_executed"]
-    assert "generate_videos" in results["steps_executed"]
-    print("   PASS - Toutes les étapes exécutées")
-
-    # Vérifier les coûts
-    assert "costs_real" in results
-    assert all(v == 0 for v in results["costs_real"].values()), "Dry run devrait avoir coûts = 0"
-    print("   PASS - Coûts = 0 (dry_run)")
-
-    # Test 2: Pipeline scenario_only
-    print("\n>>> TEST 2: Pipeline SCENARIO_ONLY (dry_run)")
-    pipeline2 = DreamPipeline(
-        output_dir=str(output_dir / "test2"),
-        dry_run=True,
-        verbose=False,
-        config=config
-    )
 
-    results2 = pipeline2.run(
-        steps=dict(PRESETS["scenario_only"]),
-        dream_statement=dream,
-        user_photos=fake_photos,
-        character_name="TestUser",
-        character_gender="male",
-    )
+def _zero_costs(results: dict) -> bool:
+    """Dry run : aucun coût réel."""
+    return all(v == 0 for v in results.get("costs_real", {}).values())
+
 
-    assert results2.get("success"), f"Pipeline scenario_only failed: {results2.get('errors')}"
-    assert "generate_keyframes" not in results2["steps_executed"]
-    assert "generate_videos" not in results2["steps_executed"]
-    print("   PASS - Étapes keyframes/vidéos non exécutées")
+# (id, preset, mode, gender, étapes requises, étapes interdites, prédicat)
+CASES = (
+    ("full", "full", "scenario", "female", EXPECTED_FULL_STEPS, frozenset(), _zero_costs),
+    ("scenario_only", "scenario_only", "scenario", "male", frozenset(), EXPECTED_SCENARIO_ONLY_NOT, _zero_costs),
+    ("free_scenes", "scenario_only", "free_scenes", "female", frozenset(), frozenset(), _zero_costs),
+)
 
-    # Test 3: Mode free_scenes
-    print("\n>>> TEST 3: Mode FREE_SCENES (dry_run)")
-    config_free = dict(config)
-    config_free["mode"] = "free_scenes"
 
-    pipeline3 = DreamPipeline(
-        output_dir=str(output_dir / "test3"),
+def _run_one(preset: str, mode: str, gender: str, output_dir: str, photos: list) -> dict:
+    """Un dry run complet avec son propre pipeline (top-level : picklable)."""
+    pipeline = DreamPipeline(
+        output_dir=output_dir,
         dry_run=True,
-        verbose=False,
-        config=config_free
+        verbose=VERBOSE,
+        config=make_config(mode=mode)
     )
-
-    results3 = pipeline3.run(
-        steps=dict(PRESETS["scenario_only"]),
-        dream_statement=dream,
-        user_photos=fake_photos,
+    return pipeline.run(
+        steps=PRESETS[preset],
+        dream_statement=DREAM,
+        user_photos=photos,
         character_name="TestUser",
-        character_gender="female",
+        character_gender=gender,
     )
 
-    assert results3.get("success"), f"Pipeline free_scenes failed: {results3.get('errors')}"
-    print("   PASS - Mode free_scenes OK")
-
-    # Nettoyage
-    shutil.rmtree(tmp_dir, ignore_errors=True)
 
-    print("\n" + "=" * 70)
-    print("TOUS LES TESTS PASSENT")
-    print("=" * 70)
-    return True
+@pytest.fixture(scope="session")
+def dry_results(tmp_path_factory, fake_photos) -> dict:
+    """Les dry runs lancés en parallèle (un process chacun, output_dir séparés)."""
+    jobs = [
+        (preset, mode, gender, str(tmp_path_factory.mktemp(case_id)), fake_photos)
+        for case_id, preset, mode, gender, *_ in CASES
+    ]
+    try:
+        with ProcessPoolExecutor(max_workers=len(jobs)) as ex:
+            results = list(ex.map(_run_one, *zip(*jobs)))
+    except (BrokenProcessPool, OSError, NotImplementedError):
+        # Pas de multiprocessing dispo : threads (dry run surtout I/O)
+        with ThreadPoolExecutor(max_workers=len(jobs)) as ex:
+            results = list(ex.map(_run_one, *zip(*jobs)))
+    return {case[0]: r for case, r in zip(CASES, results)}
+
+
+def _check(results: dict, required: frozenset, forbidden: frozenset, pred=None) -> list:
+    """Tous les problèmes d'un run (liste vide = OK), sans s'arrêter au premier."""
+    if not results.get("success"):
+        return [f"failed: {results.get('errors')}"]
+    problems = []
+    executed = set(results.get("steps_executed", ()))
+    if required - executed:
+        problems.append(f"missing steps: {sorted(required - executed)}")
+    if forbidden & executed:
+        problems.append(f"unexpected steps: {sorted(forbidden & executed)}")
+    if "costs_real" not in results:
+        problems.append("costs_real absent")
+    if pred is not None and not pred(results):
+        problems.append(f"{pred.__name__} failed")
+    return problems
+
+
+@pytest.mark.parametrize("case", CASES, ids=[c[0] for c in CASES])
+def test_pipeline(dry_results, case):
+    """Pipeline en dry_run : étapes requises/interdites, coûts nuls."""
+    case_id, preset, mode, _, required, forbidden, pred = case
+    problems = _check(dry_results[case_id], required, forbidden, pred)
+    assert problems == [], f"{preset}/{mode}: {problems}"
 
 
 if __name__ == "__main__":
-    try:
-        success = run_dry_test()
-        sys.exit(0 if success else 1)
-    except Exception as e:
-        print(f"\n ÉCHEC: {e}")
-        import traceback
-        traceback.print_exc()
-        sys.exit(1)
+    sys.exit(pytest.main([__file__, "-v"]))
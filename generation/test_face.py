@@ -1,14 +1,19 @@
 #!/usr/bin/env python3
 """Test rapide : génération + validation d'UNE image."""
 
+import os
 import sys
 from pathlib import Path
-sys.path.insert(0, str(Path(__file__).parent))
 
-from services.image_generator import ImageGenerator
-from services.image_validator import ImageValidator
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent))
+from testutils import VERBOSE, SEP, api_key_available, log
 
-PHOTO_REF = "/Users/nathalie/Dropbox/____BIG_BOFF___/PROJETS/PRO/SUBLYM0118/photos/IMG_2913.jpeg"
+PHOTO_REF = os.environ.get(
+    "SUBLYM_TEST_REF_PHOTO",
+    "/Users/nathalie/Dropbox/____BIG_BOFF___/PROJETS/PRO/SUBLYM0118/photos/IMG_2913.jpeg",
+)
 OUTPUT = "/tmp/test_face_output.png"
 
 config = {
@@ -51,48 +56,64 @@ shooting = {
     "focus_on": "face",
 }
 
-print("=" * 60)
-print("TEST GÉNÉRATION + VALIDATION")
-print("=" * 60)
-
-# 1. Générer
-gen = ImageGenerator(config, verbose=True)
-result = gen.generate_keyframe(
-    scene_description=scene,
-    shooting_specs=shooting,
-    reference_images=[PHOTO_REF],
-    scene_palette=["#FFFFFF", "#C0C0C0", "#2F4F4F"],
-    is_same_day=False,
-    output_path=OUTPUT,
+
+@pytest.mark.skipif(
+    not Path(PHOTO_REF).exists() or not api_key_available("GEMINI_API_KEY"),
+    reason="test d'intégration local (photo de référence + GEMINI_API_KEY)",
 )
+def test_face_generation(make_face_validator, tmp_path):
+    # Import ici : la collecte pytest ne charge pas Gemini pour rien
+    from services.image_generator import ImageGenerator
 
-if not result.get("success"):
-    print(f"\n❌ Génération échouée: {result.get('error')}")
-    sys.exit(1)
+    log(SEP)
+    log("TEST GÉNÉRATION + VALIDATION")
+    log(SEP)
 
-print(f"\n✅ Image générée: {OUTPUT}")
+    # 1. Générer
+    gen = ImageGenerator(config, verbose=VERBOSE)
+    result = gen.generate_keyframe(
+        scene_description=scene,
+        shooting_specs=shooting,
+        reference_images=[PHOTO_REF],
+        scene_palette=["#FFFFFF", "#C0C0C0", "#2F4F4F"],
+        is_same_day=False,
+        output_path=OUTPUT,
+    )
 
-# 2. Valider
-validator = ImageValidator(config, verbose=True)
-validator.set_run_dir("/tmp")
+    if not result.get("success"):
+        log(f"\n❌ Génération échouée: {result.get('error')}")
+        pytest.fail(f"Génération échouée: {result.get('error')}")
+
+    log(f"\n✅ Image générée: {OUTPUT}")
+
+    # 2. Valider
+    validator = make_face_validator(config)  # partagé pour cette config
+    validator.set_run_dir(str(tmp_path))
+
+    val = validator.validate(
+        image_path=OUTPUT,
+        references={"user_photo": PHOTO_REF},
+        scene_id=1,
+        kf_type="start",
+        palette=["#FFFFFF", "#C0C0C0", "#2F4F4F"],
+        description=scene["description"],
+    )
+
+    if not VERBOSE:
+        return
+    print(f"\n{SEP}")
+    print(f"RÉSULTAT: {'✅ PASS' if val['passed'] else '❌ FAIL'}")
+    print(f"Gemini score: {val.get('global_score', 0):.2f}")
+    if val.get("face_validation"):
+        fv = val["face_validation"]
+        print(f"DeepFace: {fv['scores']['deepface']:.4f}")
+        print(f"ArcFace:  {fv['scores']['arcface']:.4f}")
+        print(f"Gap:      {fv['cumulative_gap']:.4f} (tolérance: 0.3)")
+    if val.get("failures"):
+        print(f"Échecs:   {val['failures']}")
+    print(SEP)
 
-val = validator.validate(
-    image_path=OUTPUT,
-    references={"user_photo": PHOTO_REF},
-    scene_id=1,
-    kf_type="start",
-    palette=["#FFFFFF", "#C0C0C0", "#2F4F4F"],
-    description=scene["description"],
-)
 
-print(f"\n{'=' * 60}")
-print(f"RÉSULTAT: {'✅ PASS' if val['passed'] else '❌ FAIL'}")
-print(f"Gemini score: {val.get('global_score', 0):.2f}")
-if val.get("face_validation"):
-    fv = val["face_validation"]
-    print(f"DeepFace: {fv['scores']['deepface']:.4f}")
-    print(f"ArcFace:  {fv['scores']['arcface']:.4f}")
-    print(f"Gap:      {fv['cumulative_gap']:.4f} (tolérance: 0.3)")
-if val.get("failures"):
-    print(f"Échecs:   {val['failures']}")
-print(f"{'=' * 60}")
+if __name__ == "__main__":
+    # Via pytest pour la fixture make_face_validator (conftest.py)
+    sys.exit(pytest.main([__file__, "-s"]))
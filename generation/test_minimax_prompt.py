@@ -3,74 +3,36 @@
 Compare vidéo avec prompt vague vs prompt détaillé.
 """
 
+import os
 import sys
-import json
 import base64
+import mmap
 import time
 import mimetypes
-import urllib.request
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 
+import pytest
+
 sys.path.insert(0, str(Path(__file__).parent))
+from testutils import api_key_available
+from services import fast_json
 from services.env_loader import get_api_key
+from services.http_session import get_session
 
 KF_DIR = Path("/Users/nathalie/Dropbox/____BIG_BOFF___/PROJETS/PRO/SUBLYM_APP_PUB/Avatars/Julien36/Julien/output/dreams/julien_i_would_love_to_live_and_work__bd2cdab8/keyframes")
 OUT_DIR = KF_DIR.parent / "test_prompts"
-OUT_DIR.mkdir(exist_ok=True)
+# Chemins en str calculés une fois (open/getmtime/cache lru par chemin)
+KF_DIR_S = str(KF_DIR)
+OUT_DIR_S = str(OUT_DIR)
 
 VIDEO_MODEL = "fal-ai/minimax/hailuo-02/standard/image-to-video"
 FAL_BASE_URL = "https://fal.run/"
 
-
-def to_data_uri(path):
-    mime, _ = mimetypes.guess_type(str(path))
-    with open(path, "rb") as f:
-        data = base64.b64encode(f.read()).decode("utf-8")
-    return f"data:{mime or 'image/png'};base64,{data}"
-
-
-def generate_video(prompt, start_image, end_image, output_path):
-    api_key = get_api_key("FAL_KEY")
-
-    payload = {
-        "prompt": prompt,
-        "image_url": to_data_uri(start_image),
-        "end_image_url": to_data_uri(end_image),
-        "prompt_optimizer": False
-    }
-
-    print(f"  Calling fal.ai...")
-    req = urllib.request.Request(
-        f"{FAL_BASE_URL}{VIDEO_MODEL}",
-        data=json.dumps(payload).encode("utf-8"),
-        headers={"Authorization": f"Key {api_key}", "Content-Type": "application/json"}
-    )
-
-    with urllib.request.urlopen(req, timeout=600) as response:
-        result = json.loads(response.read().decode("utf-8"))
-
-    video_url = result.get("video", {}).get("url")
-    if video_url:
-        urllib.request.urlretrieve(video_url, str(output_path))
-        print(f"  OK: {output_path}")
-        return True
-    else:
-        print(f"  FAIL: no video URL")
-        return False
-
-
-if __name__ == "__main__":
-    start_0A = KF_DIR / "start_keyframe_0A.png"
-    end_0A = KF_DIR / "end_keyframe_0A.png"
-    start_D = KF_DIR / "start_keyframe_D.png"
-    end_D = KF_DIR / "end_keyframe_D.png"
-
-    # ====== TEST A: Scene 0A — prompt détaillé ======
-    print("=" * 60)
-    print("TEST A: Scene 0A — prompt step-by-step détaillé")
-    print("=" * 60)
-
-    prompt_A = """Smooth 6-second cinematic video.
+# Prompts step-by-step détaillés (scène 0A : bureau, scène D : loft NYC)
+PROMPT_A = """Smooth 6-second cinematic video.
 
 CHARACTER ACTION: Man sitting at desk slowly shifts his weight and drifts into thought.
 
@@ -93,17 +55,7 @@ RULES:
 4. Character's face must stay IDENTICAL throughout
 5. Smooth, natural human movement only"""
 
-    print(f"  Start: {start_0A}")
-    print(f"  End: {end_0A}")
-    generate_video(prompt_A, str(start_0A), str(end_0A), OUT_DIR / "test_A_scene0A_detailed.mp4")
-
-    # ====== TEST B: Scene D — prompt détaillé ======
-    print()
-    print("=" * 60)
-    print("TEST B: Scene D — prompt step-by-step détaillé")
-    print("=" * 60)
-
-    prompt_B = """Smooth 6-second cinematic video.
+PROMPT_B = """Smooth 6-second cinematic video.
 
 CHARACTER ACTION: Man suddenly realizes his surroundings have changed, looks around in growing wonder.
 
@@ -126,9 +78,105 @@ RULES:
 4. Character's face must stay IDENTICAL throughout
 5. Smooth, natural human movement only"""
 
-    print(f"  Start: {start_D}")
-    print(f"  End: {end_D}")
-    generate_video(prompt_B, str(start_D), str(end_D), OUT_DIR / "test_B_sceneD_detailed.mp4")
+# (label, prompt, keyframe début, keyframe fin)
+CASES = (
+    ("A_scene0A_detailed", PROMPT_A, "start_keyframe_0A.png", "end_keyframe_0A.png"),
+    ("B_sceneD_detailed", PROMPT_B, "start_keyframe_D.png", "end_keyframe_D.png"),
+)
+
+
+@lru_cache(maxsize=32)
+def _data_uri_cached(path: str, mtime: float) -> str:
+    mime, _ = mimetypes.guess_type(path)
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            data = ""
+        else:
+            # mmap : encodage direct depuis le page cache, sans copie bytes du fichier
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                data = base64.b64encode(mm).decode("utf-8")
+    return f"data:{mime or 'image/png'};base64,{data}"
+
+
+def to_data_uri(path):
+    """Data URI d'une image (str ou Path), mis en cache par (chemin, mtime)."""
+    path = os.fspath(path)
+    return _data_uri_cached(path, os.path.getmtime(path))
+
+
+def generate_video(prompt, start_image, end_image, output_path):
+    api_key = get_api_key("FAL_KEY")
+
+    payload = {
+        "prompt": prompt,
+        "image_url": to_data_uri(start_image),
+        "end_image_url": to_data_uri(end_image),
+        "prompt_optimizer": False
+    }
+
+    print(f"  Calling fal.ai...")
+    # Session keep-alive partagée : une seule connexion TLS pour les appels fal.ai
+    session = get_session()
+    response = session.post(
+        f"{FAL_BASE_URL}{VIDEO_MODEL}",
+        data=fast_json.dumps(payload),  # orjson si installé
+        headers={"Authorization": f"Key {api_key}", "Content-Type": "application/json"},
+        timeout=600,
+    )
+    response.raise_for_status()
+    result = fast_json.loads(response.content)
+
+    video_url = result.get("video", {}).get("url")
+    if video_url:
+        # Téléchargement en flux par blocs de 1 Mio
+        with session.get(video_url, stream=True, timeout=600) as resp:
+            resp.raise_for_status()
+            resp.raw.decode_content = True
+            with open(output_path, "wb") as f:
+                shutil.copyfileobj(resp.raw, f, length=1 << 20)
+        print(f"  OK: {output_path}")
+        return True
+    else:
+        print(f"  FAIL: no video URL")
+        return False
+
+
+def run_case(label, prompt, start_name, end_name):
+    """Génère la vidéo d'un cas de CASES dans OUT_DIR."""
+    OUT_DIR.mkdir(exist_ok=True)
+    return generate_video(
+        prompt,
+        os.path.join(KF_DIR_S, start_name),
+        os.path.join(KF_DIR_S, end_name),
+        os.path.join(OUT_DIR_S, f"test_{label}.mp4"),
+    )
+
+
+# Générations facturées : opt-in explicite, jamais lancées par un simple `pytest generation/`
+RUN_PAID_TESTS = os.environ.get("SUBLYM_RUN_PAID_TESTS", "0") not in ("", "0")
+
+
+@pytest.mark.skipif(
+    not RUN_PAID_TESTS or not KF_DIR.exists() or not api_key_available("FAL_KEY"),
+    reason="test d'intégration payant (SUBLYM_RUN_PAID_TESTS=1 + keyframes + FAL_KEY)",
+)
+@pytest.mark.parametrize("label,prompt,start_name,end_name", CASES, ids=[c[0] for c in CASES])
+def test_minimax_prompt(label, prompt, start_name, end_name):
+    assert run_case(label, prompt, start_name, end_name)
+
+
+if __name__ == "__main__":
+    for label, _, start_name, end_name in CASES:
+        print("=" * 60)
+        print(f"TEST {label} — prompt step-by-step détaillé")
+        print("=" * 60)
+        print(f"  Start: {KF_DIR / start_name}")
+        print(f"  End: {KF_DIR / end_name}")
+        print()
+
+    # Les appels fal.ai (jusqu'à 600s chacun) en parallèle
+    with ThreadPoolExecutor(max_workers=len(CASES)) as ex:
+        list(ex.map(lambda case: run_case(*case), CASES))
 
     print()
     print("=" * 60)
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Sublym v4 - Cache de validation du ScenarioGenerator
+Un appel validateur en échec ne doit pas être mis en cache (aucun appel réseau).
+
+    pytest generation/test_scenario_validation.py
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from config.settings import DEFAULT_CONFIG
+from services.scenario_generator import ScenarioGenerator
+
+ERROR_RESULT = {"answer": "", "data": {}, "reasoning": "Error: 429 Too Many Requests"}
+OK_RESULT = {"score": 0.9, "passed": True, "feedback": "ok", "final_pass": True, "confidence": 0.9}
+
+
+@pytest.fixture
+def generator(monkeypatch):
+    """ScenarioGenerator dont l'appel OpenAI échoue une fois, puis répond."""
+    gen = ScenarioGenerator(dict(DEFAULT_CONFIG))
+    gen._context = "REVE: test"
+    responses = [ERROR_RESULT]
+    calls = []
+
+    def fake_call(*args, **kwargs):
+        calls.append(args)
+        return dict(responses.pop(0) if responses else OK_RESULT)
+
+    monkeypatch.setattr(gen, "_call_openai_structured", fake_call)
+    gen.calls = calls
+    return gen
+
+
+def test_failed_validation_not_cached(generator):
+    v1, _, _ = generator._validate("réponse", "question", "critère", level="light")
+    assert not v1["passed"]
+    assert len(generator.calls) == 1
+
+    # Même réponse : l'échec n'a pas été mis en cache, l'API est rappelée
+    v1, _, _ = generator._validate("réponse", "question", "critère", level="light")
+    assert v1["passed"]
+    assert len(generator.calls) == 2
+
+    # Verdict réel : servi depuis le cache
+    generator._validate("réponse", "question", "critère", level="light")
+    assert len(generator.calls) == 2
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-v"]))
@@ -1,42 +1,90 @@
 #!/usr/bin/env python3
 """Quick test: Gemini 2.5 Flash vision validation with responseMimeType."""
 
+import os
 import sys
 import json
 import base64
-import urllib.request
+import io
+import mimetypes
+import mmap
+from functools import lru_cache
 from pathlib import Path
 
+import pytest
+
+# Import conditionnel pour la dépendance optionnelle
+try:
+    from PIL import Image
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
 sys.path.insert(0, str(Path(__file__).parent))
-from services.env_loader import get_api_key
+from testutils import api_key_available, log
 
 # Paths
 JULIEN_DIR = Path("/Users/nathalie/Dropbox/____BIG_BOFF___/PROJETS/PRO/SUBLYM_APP_PUB/Avatars/Julien36/Julien")
-REF_PHOTO = JULIEN_DIR / "Julien_laughing.png"
+REF_PHOTO = Path(os.environ.get("SUBLYM_TEST_REF_PHOTO", JULIEN_DIR / "Julien_laughing.png"))
 GENERATED = JULIEN_DIR / "output/dreams/julien_i_would_love_to_live_and_work__1ce70dc4/keyframes/start_keyframe_0A.png"
+REF_PHOTO_S = str(REF_PHOTO)
+GENERATED_S = str(GENERATED)
 
 MODEL = "gemini-2.5-flash"
+MAX_SIDE = 1024  # côté long envoyé à Gemini (suffisant pour un score de similarité)
 
-def encode_image(path):
-    with open(path, "rb") as f:
-        return base64.b64encode(f.read()).decode("utf-8")
 
+@lru_cache(maxsize=32)
+def _encode_cached(path: str, mtime: float) -> str:
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return ""
+        # mmap : encodage direct depuis le page cache, sans copie bytes du fichier
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return base64.b64encode(mm).decode("utf-8")
+
+@lru_cache(maxsize=32)
+def _compact_cached(path: str, mtime: float) -> tuple:
+    if PIL_AVAILABLE:
+        with Image.open(path) as im:
+            if max(im.size) > MAX_SIDE:
+                im = im.convert("RGB")
+                im.thumbnail((MAX_SIDE, MAX_SIDE), Image.LANCZOS)
+                buf = io.BytesIO()
+                im.save(buf, "JPEG", quality=85, optimize=True)
+                return base64.b64encode(buf.getvalue()).decode("utf-8"), "image/jpeg"
+    return _encode_cached(path, mtime), mimetypes.guess_type(path)[0] or "image/png"
+
+def compact_image(path):
+    """(base64, mime) : JPEG réduit à MAX_SIDE si Pillow dispo et image plus grande, sinon fichier tel quel."""
+    path = os.fspath(path)
+    return _compact_cached(path, os.path.getmtime(path))
+
+@pytest.mark.skipif(
+    not REF_PHOTO.exists() or not GENERATED.exists() or not api_key_available("GEMINI_API_KEY"),
+    reason="test d'intégration local (photos de référence + GEMINI_API_KEY)",
+)
 def test_validation():
+    # Import ici : services/ charge tous les modèles à l'import
+    from services import fast_json
+    from services.env_loader import get_api_key
+    from services.http_session import get_session
+
     api_key = get_api_key("GEMINI_API_KEY")
 
-    print(f"Model: {MODEL}")
-    print(f"Ref: {REF_PHOTO}")
-    print(f"Gen: {GENERATED}")
+    log(f"Model: {MODEL}")
+    log(f"Ref: {REF_PHOTO}")
+    log(f"Gen: {GENERATED}")
 
     if not REF_PHOTO.exists():
-        print(f"Ref photo not found: {REF_PHOTO}")
+        log(f"Ref photo not found: {REF_PHOTO}")
         return
     if not GENERATED.exists():
-        print(f"Generated image not found: {GENERATED}")
+        log(f"Generated image not found: {GENERATED}")
         return
 
-    ref_b64 = encode_image(str(REF_PHOTO))
-    gen_b64 = encode_image(str(GENERATED))
+    ref_b64, ref_mime = compact_image(REF_PHOTO_S)
+    gen_b64, gen_mime = compact_image(GENERATED_S)
 
     prompt = """Compare IMAGE 2 (generated) against IMAGE 1 (reference photo).
 IMAGE 1 = REFERENCE PHOTO (the real person)
@@ -59,8 +107,8 @@ Reply in JSON:
 }"""
 
     parts = [
-        {"inline_data": {"mime_type": "image/png", "data": ref_b64}},
-        {"inline_data": {"mime_type": "image/png", "data": gen_b64}},
+        {"inline_data": {"mime_type": ref_mime, "data": ref_b64}},
+        {"inline_data": {"mime_type": gen_mime, "data": gen_b64}},
         {"text": prompt}
     ]
 
@@ -75,46 +123,52 @@ Reply in JSON:
 
     url = f"https://generativelanguage.googleapis.com/v1beta/models/{MODEL}:generateContent?key={api_key}"
 
-    print(f"\nCalling {MODEL}...")
-    req = urllib.request.Request(
+    log(f"\nCalling {MODEL}...")
+    # Session keep-alive partagée (même pool que les services), corps encodé via orjson si dispo
+    response = get_session().post(
         url,
-        data=json.dumps(payload).encode("utf-8"),
-        headers={"Content-Type": "application/json"}
+        data=fast_json.dumps(payload),
+        headers={"Content-Type": "application/json"},
+        timeout=120,
     )
-
-    with urllib.request.urlopen(req, timeout=120) as response:
-        result = json.loads(response.read().decode("utf-8"))
+    response.raise_for_status()
+    result = fast_json.loads(response.content)
 
     # Check response structure
-    print(f"\nResponse keys: {list(result.keys())}")
+    log(f"\nResponse keys: {list(result.keys())}")
 
     usage = result.get("usageMetadata", {})
-    print(f"Tokens in: {usage.get('promptTokenCount', '?')}, out: {usage.get('candidatesTokenCount', '?')}")
+    log(f"Tokens in: {usage.get('promptTokenCount', '?')}, out: {usage.get('candidatesTokenCount', '?')}")
 
     try:
         text = result["candidates"][0]["content"]["parts"][0]["text"]
-        print(f"\nRaw response (first 1000 chars):\n{text[:1000]}")
+        log(f"\nRaw response (first 1000 chars):\n{text[:1000]}")
 
         # Try parsing
-        parsed = json.loads(text)
-        print(f"\nParsed OK!")
-        print(f"Global score: {parsed.get('global_score')}")
-        print(f"Is same person: {parsed.get('is_same_person')}")
-        print(f"Major issues: {parsed.get('major_issues')}")
+        parsed = fast_json.loads(text)
+        log(f"\nParsed OK!")
+        log(f"Global score: {parsed.get('global_score')}")
+        log(f"Is same person: {parsed.get('is_same_person')}")
+        log(f"Major issues: {parsed.get('major_issues')}")
         if parsed.get("scores"):
-            print("\nScores:")
+            log("\nScores:")
             for k, v in parsed["scores"].items():
                 if isinstance(v, dict):
-                    print(f"  {k}: {v.get('score', '?')} — {v.get('comment', '')[:80]}")
+                    log(f"  {k}: {v.get('score', '?')} — {v.get('comment', '')[:80]}")
                 else:
-                    print(f"  {k}: {v}")
+                    log(f"  {k}: {v}")
     except (KeyError, IndexError) as e:
-        finish_reason = result.get("candidates", [{}])[0].get("finishReason", "unknown")
-        print(f"\nNo text in response! finishReason={finish_reason}")
-        print(f"Full candidates: {json.dumps(result.get('candidates', []), indent=2)[:500]}")
-    except json.JSONDecodeError as e:
-        print(f"\nJSON parse error: {e}")
-        print(f"Raw text: {text[:500]}")
+        finish_reason = (result.get("candidates") or [{}])[0].get("finishReason", "unknown")
+        log(f"\nNo text in response! finishReason={finish_reason}")
+        log(f"Full candidates: {json.dumps(result.get('candidates', []), indent=2)[:500]}")
+        pytest.fail(f"No text in response (finishReason={finish_reason})")
+    except json.JSONDecodeError as e:  # orjson.JSONDecodeError en hérite
+        log(f"\nJSON parse error: {e}")
+        log(f"Raw text: {text[:500]}")
+        pytest.fail(f"JSON parse error: {e}")
+
+    assert "global_score" in parsed, f"global_score absent: {list(parsed)}"
+    assert parsed.get("scores"), f"scores absent ou vide: {list(parsed)}"
 
 if __name__ == "__main__":
     test_validation()
@@ -0,0 +1,34 @@
+"""
+Sublym v4 - Utilitaires des tests d'intégration
+Module simple (pas conftest.py : pytest le charge déjà comme generation.conftest).
+"""
+
+import os
+import sys
+from pathlib import Path
+
+
+def _launched_directly() -> bool:
+    """True si un script de test est lancé seul (python test_x.py), pas via pytest."""
+    main = sys.modules.get("__main__")
+    return Path(getattr(main, "__file__", None) or "").name.startswith("test_")
+
+
+# Sortie détaillée : SUBLYM_TEST_VERBOSE=1, ou lancement direct d'un script de test
+VERBOSE = os.environ.get("SUBLYM_TEST_VERBOSE", "0") not in ("", "0") or _launched_directly()
+SEP = "=" * 60
+
+
+def log(*args):
+    if VERBOSE:
+        print(*args)
+
+
+def api_key_available(name: str) -> bool:
+    """True si la clé est dans l'environnement ou un .env (mêmes sources que get_api_key)."""
+    if os.environ.get(name):
+        return True
+    # Import seulement si besoin : services/ charge tous les modèles à l'import
+    from services.env_loader import load_env
+    load_env()
+    return bool(os.environ.get(name))